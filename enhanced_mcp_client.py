@@ -1,19 +1,27 @@
 import asyncio
+import atexit
+import bisect
+import io
+import itertools
 import json
 import os
-import pickle
+import time
 import uuid
+from collections import Counter, OrderedDict
 from contextlib import AsyncExitStack
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
+import httpx
+import msgspec
 import nest_asyncio
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import OpenAI
+from mcp.types import TextContent, TextResourceContents
+from openai import AsyncOpenAI
 
 nest_asyncio.apply()
 load_dotenv()
@@ -26,41 +34,155 @@ class MessageRole(str, Enum):
     TOOL = "tool"
 
 
-@dataclass
+# Plain dict lookup instead of EnumType.__call__ on every message load
+_ROLE_CACHE = {role.value: role for role in MessageRole}
+
+_ROLE_EMOJI = {"user": "👤", "assistant": "🤖", "tool": "🔧"}
+
+
+# One urandom read per process instead of one per message: ids are the
+# random epoch prefix plus a monotonically increasing counter. itertools
+# .count() increments atomically under the GIL, so this is thread-safe.
+_ID_EPOCH = os.urandom(6).hex()
+_id_counter = itertools.count()
+
+
+def _new_message_id() -> str:
+    """Cheap unique id for messages; session ids stay full uuid4."""
+    return f"{_ID_EPOCH}-{next(_id_counter)}"
+
+
+# Template for per-tool-call info dicts; copied (one C-level memcpy of a
+# compact dict) instead of rebuilding the six-key literal on every call.
+# The dicts themselves can't be pooled: they are retained by reference in
+# the response payload and session history.
+# Prompt-size bound for a single tool result; history grows quadratically
+# with repeated large outputs, so the copy fed back to the model is capped.
+# The full result is still stored in memory and the response payload.
+_MAX_TOOL_RESULT_CHARS = 8192
+
+_TOOL_INFO_TEMPLATE = {
+    "tool_name": None,
+    "tool_args": None,
+    "tool_id": None,
+    "success": False,
+    "result": None,
+    "error": None,
+}
+
+
+@dataclass(slots=True)
 class ChatMessage:
     id: str
     role: MessageRole
     content: str
-    timestamp: datetime
+    # Epoch seconds; formatted only for display
+    timestamp: float
     tool_calls: Optional[List[Dict]] = None
     tool_call_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationSession:
     id: str
     title: str
-    created_at: datetime
-    last_activity: datetime
+    # Epoch seconds; formatted only for display
+    created_at: float
+    last_activity: float
     messages: List[ChatMessage]
     context: Dict[str, Any]
+    # Per-role counters kept in sync by add_message so stats never rescan
+    # the message list.
+    user_count: int = 0
+    assistant_count: int = 0
+    tool_count: int = 0
+    # Serialized history tail, rebuilt lazily after each new message
+    _history_cache: Optional[List[Dict[str, Any]]] = field(
+        default=None, repr=False, compare=False
+    )
+    _history_cache_limit: int = field(default=0, repr=False, compare=False)
+
+
+# Persistence schemas. Messages live in one append-only JSONL log per
+# session; session metadata lives in a small msgpack index. Timestamps are
+# stored as epoch floats so save/load skips the isoformat round-trip.
+class ChatMessageS(msgspec.Struct):
+    id: str
+    role: str
+    content: str
+    timestamp: float
+    tool_calls: Optional[List[Dict]] = None
+    tool_call_id: Optional[str] = None
+
+
+class SessionMetaS(msgspec.Struct):
+    id: str
+    title: str
+    created_at: float
+    last_activity: float
+    context: Dict[str, Any]
+
+
+class SessionIndexS(msgspec.Struct):
+    sessions: List[SessionMetaS]
+    current_session_id: Optional[str]
+
+
+# Compiled once at import time; reused for every save/load.
+_msg_enc = msgspec.json.Encoder()
+# Deterministic key order, for canonical tool-argument cache keys
+_canon_enc = msgspec.json.Encoder(order="deterministic")
+_msg_dec = msgspec.json.Decoder(ChatMessageS)
+_idx_enc = msgspec.msgpack.Encoder()
+_idx_dec = msgspec.msgpack.Decoder(SessionIndexS)
 
 
 class MemoryManager:
-    def __init__(self, storage_file: str = "chat_memory.pkl", max_sessions: int = 50):
-        self.storage_file = storage_file
+    def __init__(self, storage_dir: str = "sessions", max_sessions: int = 50):
+        self.storage_dir = storage_dir
+        self.index_file = os.path.join(storage_dir, "sessions_index.msgpack")
         self.max_sessions = max_sessions
-        self.sessions: Dict[str, ConversationSession] = {}
+        # Ordered most-recently-used first so listing and eviction never sort.
+        self.sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        # Sorted ids for O(log N) prefix lookup in /switch and /delete
+        self._sorted_ids: List[str] = []
         self.current_session_id: Optional[str] = None
+        # Running total across sessions; stats endpoints read it instead of
+        # rescanning every session's message list.
+        self.total_messages = 0
+        self._log_files: Dict[str, BinaryIO] = {}
+        self._dirty = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
         self.load_memory()
+        atexit.register(self.flush)
+
+    def _session_log_path(self, session_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{session_id}.jsonl")
+
+    def _get_log_file(self, session_id: str) -> BinaryIO:
+        log_file = self._log_files.get(session_id)
+        if log_file is None:
+            os.makedirs(self.storage_dir, exist_ok=True)
+            # Unbuffered: each append is a single write(2) straight to the
+            # page cache, so a killed process loses at most the message being
+            # written. Durability to disk stays batched in flush().
+            log_file = open(self._session_log_path(session_id), "ab", buffering=0)
+            self._log_files[session_id] = log_file
+        return log_file
+
+    def _close_log_file(self, session_id: str):
+        log_file = self._log_files.pop(session_id, None)
+        if log_file:
+            log_file.close()
 
     def create_session(self, title: str = None) -> str:
         session_id = str(uuid.uuid4())
-        now = datetime.now()
+        now = time.time()
 
         session = ConversationSession(
             id=session_id,
-            title=title or f"Chat {now.strftime('%Y-%m-%d %H:%M')}",
+            title=title
+            or f"Chat {datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M')}",
             created_at=now,
             last_activity=now,
             messages=[],
@@ -68,9 +190,11 @@ class MemoryManager:
         )
 
         self.sessions[session_id] = session
+        self.sessions.move_to_end(session_id, last=False)
+        bisect.insort(self._sorted_ids, session_id)
         self.current_session_id = session_id
         self._cleanup_old_sessions()
-        self.save_memory()
+        self._mark_dirty()
 
         return session_id
 
@@ -81,12 +205,44 @@ class MemoryManager:
 
     def switch_session(self, session_id: str) -> bool:
         if session_id in self.sessions:
+            previous = self.current_session_id
             self.current_session_id = session_id
-            self.sessions[session_id].last_activity = datetime.now()
-            self.save_memory()
+            self.sessions[session_id].last_activity = time.time()
+            self.sessions.move_to_end(session_id, last=False)
+            # The chat endpoints switch on every turn that carries a
+            # session_id, so this runs on the event-loop thread: push only
+            # the outgoing session's buffered rows to the OS and let the
+            # debounced index write pick up the pointer change. The
+            # fdatasync-everything full flush is reserved for shutdown.
+            if previous and previous != session_id:
+                log_file = self._log_files.get(previous)
+                if log_file:
+                    try:
+                        log_file.flush()
+                    except Exception as e:
+                        print(f"Error flushing session log: {e}")
+            self._mark_dirty()
             return True
         return False
 
+    def find_sessions_by_prefix(self, prefix: str, limit: int = 2) -> List[str]:
+        """Return up to `limit` session ids starting with `prefix`.
+
+        Bisects the sorted id list (O(log N + k)); two matches are enough
+        for callers to tell unique from ambiguous.
+        """
+        i = bisect.bisect_left(self._sorted_ids, prefix)
+        return [
+            session_id
+            for session_id in self._sorted_ids[i : i + limit]
+            if session_id.startswith(prefix)
+        ]
+
+    def _unregister_session_id(self, session_id: str):
+        i = bisect.bisect_left(self._sorted_ids, session_id)
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == session_id:
+            del self._sorted_ids[i]
+
     def add_message(self, message: ChatMessage):
         if not self.current_session_id:
             self.create_session()
@@ -94,14 +250,35 @@ class MemoryManager:
         session = self.sessions.get(self.current_session_id)
         if session:
             session.messages.append(message)
-            session.last_activity = datetime.now()
-            self.save_memory()
+            session._history_cache = None
+            if message.role == MessageRole.USER:
+                session.user_count += 1
+            elif message.role == MessageRole.ASSISTANT:
+                session.assistant_count += 1
+            elif message.role == MessageRole.TOOL:
+                session.tool_count += 1
+            session.last_activity = time.time()
+            self.total_messages += 1
+            self.sessions.move_to_end(session.id, last=False)
+            self._append_message(session.id, message)
+            self._mark_dirty()
 
     def get_conversation_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the serialized history tail.
+
+        The result is cached on the session and invalidated by add_message;
+        callers must not mutate the returned list.
+        """
         session = self.get_current_session()
         if not session:
             return []
 
+        if (
+            session._history_cache is not None
+            and session._history_cache_limit == limit
+        ):
+            return session._history_cache
+
         messages = []
         for msg in session.messages[-limit:]:
             if msg.role == MessageRole.TOOL:
@@ -118,166 +295,477 @@ class MemoryManager:
                     message_dict["tool_calls"] = msg.tool_calls
                 messages.append(message_dict)
 
+        session._history_cache = messages
+        session._history_cache_limit = limit
         return messages
 
-    def list_sessions(self) -> List[Dict[str, Any]]:
+    def list_sessions(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        # Snapshot first: the sync /sessions handlers run on the threadpool
+        # while the event-loop thread reorders this OrderedDict on every
+        # add_message/switch_session; list() is atomic under the GIL,
+        # iterating the live view is not.
+        values = list(self.sessions.values())
+        # Slice before the per-session metadata expansion so a paginated
+        # caller pays O(page_size), not O(total_sessions).
+        if limit is not None or offset:
+            end = offset + limit if limit is not None else None
+            values = itertools.islice(values, offset, end)
         return [
             {
                 "id": session.id,
                 "title": session.title,
-                "created_at": session.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "last_activity": session.last_activity.strftime("%Y-%m-%d %H:%M:%S"),
+                "created_at": datetime.fromtimestamp(session.created_at).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+                "last_activity": datetime.fromtimestamp(
+                    session.last_activity
+                ).strftime("%Y-%m-%d %H:%M:%S"),
                 "message_count": len(session.messages),
                 "is_current": session.id == self.current_session_id,
             }
-            for session in sorted(
-                self.sessions.values(), key=lambda s: s.last_activity, reverse=True
-            )
+            for session in values
         ]
 
     def delete_session(self, session_id: str) -> bool:
         if session_id in self.sessions:
+            self.total_messages -= len(self.sessions[session_id].messages)
             del self.sessions[session_id]
+            self._unregister_session_id(session_id)
+            self._close_log_file(session_id)
+            try:
+                os.unlink(self._session_log_path(session_id))
+            except FileNotFoundError:
+                pass
             if self.current_session_id == session_id:
                 # Switch to most recent session or create new one
-                recent_sessions = sorted(
-                    self.sessions.values(), key=lambda s: s.last_activity, reverse=True
-                )
-                self.current_session_id = (
-                    recent_sessions[0].id if recent_sessions else None
-                )
-            self.save_memory()
+                self.current_session_id = next(iter(self.sessions), None)
+            self._mark_dirty()
             return True
         return False
 
     def clear_current_session(self):
-        session = self.get_current_session()
+        if self.current_session_id:
+            self.clear_session(self.current_session_id)
+
+    def clear_session(self, session_id: str) -> bool:
+        # Addressed directly so API handlers don't have to switch the
+        # active session (a shared-state mutation) just to clear one.
+        session = self.sessions.get(session_id)
         if session:
-            session.messages.clear()
-            self.save_memory()
+            self.total_messages -= len(session.messages)
+            # Rebind to a fresh list so the old one is freed in one go
+            session.messages = []
+            session._history_cache = None
+            session.user_count = 0
+            session.assistant_count = 0
+            session.tool_count = 0
+            # Truncate the log in place; session metadata is unchanged so
+            # the index file doesn't need a rewrite.
+            log_file = self._log_files.get(session.id)
+            if log_file is not None:
+                log_file.seek(0)
+                log_file.truncate(0)
+            else:
+                try:
+                    os.truncate(self._session_log_path(session.id), 0)
+                except FileNotFoundError:
+                    pass
+            return True
+        return False
 
-    def update_session_title(self, title: str):
-        session = self.get_current_session()
+    def update_session_title(self, title: str, session_id: Optional[str] = None):
+        session = (
+            self.sessions.get(session_id)
+            if session_id
+            else self.get_current_session()
+        )
         if session:
             session.title = title
-            self.save_memory()
+            self._mark_dirty()
 
-    def get_session_stats(self) -> Dict[str, Any]:
-        session = self.get_current_session()
+    def get_session_stats(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        session = (
+            self.sessions.get(session_id)
+            if session_id
+            else self.get_current_session()
+        )
         if not session:
             return {"error": "No active session"}
 
-        tool_calls = sum(1 for msg in session.messages if msg.role == MessageRole.TOOL)
-        user_messages = sum(
-            1 for msg in session.messages if msg.role == MessageRole.USER
-        )
-        assistant_messages = sum(
-            1 for msg in session.messages if msg.role == MessageRole.ASSISTANT
-        )
-
         return {
             "session_id": session.id,
             "title": session.title,
             "total_messages": len(session.messages),
-            "user_messages": user_messages,
-            "assistant_messages": assistant_messages,
-            "tool_calls": tool_calls,
-            "created_at": session.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "duration": str(datetime.now() - session.created_at).split(".")[0],
+            "user_messages": session.user_count,
+            "assistant_messages": session.assistant_count,
+            "tool_calls": session.tool_count,
+            "created_at": datetime.fromtimestamp(session.created_at).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+            "duration": str(timedelta(seconds=int(time.time() - session.created_at))),
         }
 
-    def save_memory(self):
+    def _append_message(self, session_id: str, message: ChatMessage):
+        """Append one message to the session's JSONL log (no full rewrite)."""
         try:
-            # Convert to serializable format
-            data = {}
-            for session_id, session in self.sessions.items():
-                data[session_id] = {
-                    "id": session.id,
-                    "title": session.title,
-                    "created_at": session.created_at.isoformat(),
-                    "last_activity": session.last_activity.isoformat(),
-                    "context": session.context,
-                    "messages": [
-                        {
-                            "id": msg.id,
-                            "role": msg.role.value,
-                            "content": msg.content,
-                            "timestamp": msg.timestamp.isoformat(),
-                            "tool_calls": msg.tool_calls,
-                            "tool_call_id": msg.tool_call_id,
-                        }
-                        for msg in session.messages
-                    ],
-                }
+            log_file = self._get_log_file(session_id)
+            # Belt and braces: content should always be a str by now, but
+            # an encoder error here silently loses the message on reload,
+            # so coerce rather than drop.
+            content = message.content
+            if not isinstance(content, str):
+                content = str(content)
+            log_file.write(
+                _msg_enc.encode(
+                    ChatMessageS(
+                        id=message.id,
+                        role=message.role.value,
+                        content=content,
+                        timestamp=message.timestamp,
+                        tool_calls=message.tool_calls,
+                        tool_call_id=message.tool_call_id,
+                    )
+                )
+                + b"\n"
+            )
+        except Exception as e:
+            print(f"Error appending message: {e}")
 
-            save_data = {
-                "sessions": data,
-                "current_session_id": self.current_session_id,
-            }
+    def _mark_dirty(self):
+        """Schedule a debounced index write instead of writing immediately.
+
+        Callers often touch the index several times per user turn; batching
+        those into one write 0.5s later collapses them into a single syscall.
+        Outside an event loop (scripts, tests) the write happens inline.
+        """
+        self._dirty = True
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_pending()
+            return
+        self._flush_handle = loop.call_later(0.5, self.flush_pending)
+
+    def flush_pending(self):
+        """Write the index now if anything changed since the last write."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self.save_memory()
+
+    def flush(self):
+        """Force session logs to disk. Called on session switch and shutdown."""
+        for log_file in self._log_files.values():
+            try:
+                log_file.flush()
+                os.fdatasync(log_file.fileno())
+            except Exception as e:
+                print(f"Error flushing session log: {e}")
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self.save_memory()
+
+    def save_memory(self):
+        """Write the small metadata index; messages are in the per-session logs.
 
-            with open(self.storage_file, "wb") as f:
-                pickle.dump(save_data, f)
+        No-ops when nothing changed since the last write, so redundant
+        flushes (e.g. a switch that only bumped last_activity milliseconds
+        after a save) cost nothing.
+        """
+        if not self._dirty:
+            return
+        try:
+            index = SessionIndexS(
+                sessions=[
+                    SessionMetaS(
+                        id=session.id,
+                        title=session.title,
+                        created_at=session.created_at,
+                        last_activity=session.last_activity,
+                        context=session.context,
+                    )
+                    for session in self.sessions.values()
+                ],
+                current_session_id=self.current_session_id,
+            )
+
+            # Write to a temp file and os.replace so a crash mid-write can't
+            # leave a truncated index behind.
+            os.makedirs(self.storage_dir, exist_ok=True)
+            tmp_file = self.index_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(_idx_enc.encode(index))
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
         except Exception as e:
             print(f"Error saving memory: {e}")
 
     def load_memory(self):
         try:
-            if not os.path.exists(self.storage_file):
+            if not os.path.exists(self.index_file):
                 return
 
-            with open(self.storage_file, "rb") as f:
-                data = pickle.load(f)
+            with open(self.index_file, "rb") as f:
+                index = _idx_dec.decode(f.read())
 
-            # Restore sessions
-            for session_id, session_data in data.get("sessions", {}).items():
+            # Restore sessions, streaming each message log
+            for meta in index.sessions:
                 messages = []
-                for msg_data in session_data["messages"]:
-                    messages.append(
-                        ChatMessage(
-                            id=msg_data["id"],
-                            role=MessageRole(msg_data["role"]),
-                            content=msg_data["content"],
-                            timestamp=datetime.fromisoformat(msg_data["timestamp"]),
-                            tool_calls=msg_data.get("tool_calls"),
-                            tool_call_id=msg_data.get("tool_call_id"),
-                        )
-                    )
+                log_path = self._session_log_path(meta.id)
+                if os.path.exists(log_path):
+                    with open(log_path, "rb") as f:
+                        for line in f:
+                            msg_data = _msg_dec.decode(line)
+                            messages.append(
+                                ChatMessage(
+                                    id=msg_data.id,
+                                    role=_ROLE_CACHE[msg_data.role],
+                                    content=msg_data.content,
+                                    timestamp=msg_data.timestamp,
+                                    tool_calls=msg_data.tool_calls,
+                                    tool_call_id=msg_data.tool_call_id,
+                                )
+                            )
 
-                self.sessions[session_id] = ConversationSession(
-                    id=session_data["id"],
-                    title=session_data["title"],
-                    created_at=datetime.fromisoformat(session_data["created_at"]),
-                    last_activity=datetime.fromisoformat(session_data["last_activity"]),
+                self.sessions[meta.id] = ConversationSession(
+                    id=meta.id,
+                    title=meta.title,
+                    created_at=meta.created_at,
+                    last_activity=meta.last_activity,
                     messages=messages,
-                    context=session_data.get("context", {}),
+                    context=meta.context,
+                    user_count=sum(
+                        1 for m in messages if m.role == MessageRole.USER
+                    ),
+                    assistant_count=sum(
+                        1 for m in messages if m.role == MessageRole.ASSISTANT
+                    ),
+                    tool_count=sum(
+                        1 for m in messages if m.role == MessageRole.TOOL
+                    ),
                 )
 
-            self.current_session_id = data.get("current_session_id")
+            self.current_session_id = index.current_session_id
+            self._sorted_ids = sorted(self.sessions)
+            self.total_messages = sum(
+                len(session.messages) for session in self.sessions.values()
+            )
 
         except Exception as e:
             print(f"Error loading memory: {e}")
-            self.sessions = {}
+            self.sessions = OrderedDict()
+            self._sorted_ids = []
             self.current_session_id = None
+            self.total_messages = 0
 
     def _cleanup_old_sessions(self):
-        if len(self.sessions) > self.max_sessions:
-            # Keep the most recent sessions
-            sorted_sessions = sorted(
-                self.sessions.items(), key=lambda x: x[1].last_activity, reverse=True
-            )
-            sessions_to_keep = dict(sorted_sessions[: self.max_sessions])
-            self.sessions = sessions_to_keep
+        # Evict from the LRU end until we're back under the limit
+        while len(self.sessions) > self.max_sessions:
+            session_id, evicted = self.sessions.popitem(last=True)
+            self.total_messages -= len(evicted.messages)
+            self._unregister_session_id(session_id)
+            self._close_log_file(session_id)
+            try:
+                os.unlink(self._session_log_path(session_id))
+            except FileNotFoundError:
+                pass
+
+
+# Static response text, built once at import time
+_HELP_TEXT = """🤖 ENHANCED MCP CHATBOT - HELP
+    ════════════════════════════════════════════════════════════
+
+    📝 MEMORY COMMANDS:
+    /sessions          - List all chat sessions
+    /new [title]       - Create new session
+    /switch <id>       - Switch to session
+    /delete <id>       - Delete session
+    /clear             - Clear current session
+    /title <title>     - Set session title
+    /stats             - Show session statistics
+    /history [n]       - Show last n messages
+
+    📚 RESOURCE COMMANDS:
+    @meeting-emails           - Get recent meeting emails
+    @processed-meetings       - Get processed meeting data
+    @meeting-emails/<id>      - Get specific meeting email
+    @project-info             - Get project information
+    @feature-updates          - Get feature updates
+    @project-status           - Get project status
+    @company-info             - Get company information
+    @solution-info            - Get solution information
+    @company-all-info         - Get all company info
+    @company-docs             - Get company documents
+
+    🔧 SYSTEM COMMANDS:
+    /resources         - List available resources
+    /prompts           - List available prompts
+    /prompt <name>     - Execute a prompt
+    /tools             - List available tools
+    /help              - Show this help
+
+    💬 CHAT:
+    Just type your message to chat normally!
+    ════════════════════════════════════════════════════════════"""
+
+_GMAIL_RESOURCES_TEXT = (
+    "\n📧 Gmail resources:\n"
+    "- meeting-emails: Get recent meeting-related emails\n"
+    "- processed-meetings: Get processed meeting data\n"
+    "- meeting-emails/{email_id}: Get specific meeting email by ID\n"
+)
+
+_PROJECT_RESOURCES_TEXT = (
+    "\n📋 Project resources:\n"
+    "- info: Get project information from the knowledge repository\n"
+    "- feature-updates: Get feature updates from the knowledge repository\n"
+    "- status: Get project status from the knowledge repository\n"
+)
+
+_COMPANY_RESOURCES_TEXT = (
+    "\n🏢 Company resources:\n"
+    "- info: Get company information from the knowledge repository\n"
+    "- solution-info: Get solution information from the knowledge repository\n"
+    "- all-info: Get all company information from the knowledge repository\n"
+    "- docs: Get company documents from the knowledge repository\n"
+)
+
+# @command identifier -> resource URI, resolved with one dict lookup
+_RESOURCE_MAP = {
+    # Gmail resources
+    "meeting-emails": "gmail://meeting-emails",
+    "processed-meetings": "gmail://processed-meetings",
+    # Project resources
+    "project-info": "project://info",
+    "feature-updates": "project://feature-updates",
+    "project-status": "project://status",
+    # Company resources
+    "company-info": "company://info",
+    "solution-info": "company://solution-info",
+    "company-all-info": "company://all-info",
+    "company-docs": "company://docs",
+}
+
+
+class AsyncBatcher:
+    """Coalesce concurrent LLM requests into batched submissions.
+
+    Callers submit request kwargs and await a Future; a background drainer
+    collects up to max_batch in-flight requests (waiting at most max_delay_ms
+    for stragglers) and dispatches the batch in one pass, amortizing
+    scheduling overhead while keeping each caller's response isolated.
+    """
+
+    def __init__(self, create_fn, max_batch: int = 8, max_delay_ms: float = 5.0):
+        self._create_fn = create_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._drainer: Optional[asyncio.Task] = None
+
+    async def submit(self, kwargs: Dict[str, Any]):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((kwargs, future))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without awaiting completion: awaiting the batch
+            # here would head-of-line-block every later submission behind
+            # the slowest response in this one (up to the 60s read
+            # timeout). Each call runs as its own task and resolves its
+            # caller's future from a done callback.
+            for kwargs, future in batch:
+                task = asyncio.ensure_future(self._create_fn(**kwargs))
+                task.add_done_callback(
+                    lambda t, f=future: self._resolve(f, t)
+                )
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, task: "asyncio.Task"):
+        if future.cancelled():
+            # Retrieve the exception (if any) so the loop doesn't log
+            # "exception was never retrieved" for abandoned calls.
+            if not task.cancelled():
+                task.exception()
+            return
+        if task.cancelled():
+            future.cancel()
+            return
+        exc = task.exception()
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(task.result())
 
 
 class EnhancedMCPChatBot:
     def __init__(self):
         self.exit_stack = AsyncExitStack()
-        self.openai = OpenAI()
+        # One pooled HTTP/2 client for every LLM call: connections (and
+        # their TLS handshakes) are reused across turns, and HTTP/2
+        # multiplexes concurrent requests over a single connection.
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        )
+        self.openai = AsyncOpenAI(http_client=self._http)
+        self._llm_batcher = AsyncBatcher(self.openai.chat.completions.create)
         self.available_tools = []
         self.available_prompts = []
+        # Bumped whenever tools/prompts/resources change; lets API layers
+        # cache serialized catalog payloads and compare one int per request.
+        self.catalog_version = 0
+        # Cached across the scheme buckets for stats/health endpoints
+        self.resource_count = 0
         self.sessions = {}
+        # Resource sessions bucketed by URI scheme at registration time so
+        # listing and the get_resource fallback never scan self.sessions.
+        self._by_scheme: Dict[str, Dict[str, Any]] = {
+            "gmail": {},
+            "project": {},
+            "company": {},
+        }
         self.memory = MemoryManager()
         self._initialized = False
+        # Command -> coroutine handler; dispatched with one dict lookup
+        self._cmd_table = {
+            "/sessions": self._cmd_sessions,
+            "/new": self._cmd_new,
+            "/switch": self._cmd_switch,
+            "/delete": self._cmd_delete,
+            "/clear": self._cmd_clear,
+            "/title": self._cmd_title,
+            "/stats": self._cmd_stats,
+            "/history": self._cmd_history,
+            "/tools": self._cmd_tools,
+            "/resources": self._cmd_resources,
+            "/prompts": self._cmd_prompts,
+            "/prompt": self._cmd_prompt,
+            "/help": self._cmd_help,
+        }
 
     async def initialize(self):
         """Initialize the chatbot by connecting to MCP servers"""
@@ -307,11 +795,20 @@ class EnhancedMCPChatBot:
             await session.initialize()
 
             try:
+                # Registrations are collected locally and published in one
+                # snapshot swap below: connect_to_server tasks run
+                # concurrently, and readers (tool dispatch, get_resource)
+                # should never see a half-registered server.
+                registered: Dict[str, Any] = {}
+                tools: List[Dict[str, Any]] = []
+                prompts: List[Dict[str, Any]] = []
+                scheme_updates: Dict[str, Dict[str, Any]] = {}
+
                 # List available tools
                 response = await session.list_tools()
                 for tool in response.tools:
-                    self.sessions[tool.name] = session
-                    self.available_tools.append(
+                    registered[tool.name] = session
+                    tools.append(
                         {
                             "type": "function",
                             "function": {
@@ -326,8 +823,8 @@ class EnhancedMCPChatBot:
                 prompts_response = await session.list_prompts()
                 if prompts_response and prompts_response.prompts:
                     for prompt in prompts_response.prompts:
-                        self.sessions[prompt.name] = session
-                        self.available_prompts.append(
+                        registered[prompt.name] = session
+                        prompts.append(
                             {
                                 "name": prompt.name,
                                 "description": prompt.description,
@@ -340,7 +837,28 @@ class EnhancedMCPChatBot:
                 if resources_response and resources_response.resources:
                     for resource in resources_response.resources:
                         resource_uri = str(resource.uri)
-                        self.sessions[resource_uri] = session
+                        registered[resource_uri] = session
+                        scheme = resource_uri.split("://", 1)[0]
+                        if scheme in self._by_scheme:
+                            scheme_updates.setdefault(scheme, {})[
+                                resource_uri
+                            ] = session
+
+                # Copy-on-write publish: rebinding fresh dicts has no awaits,
+                # so on the event loop it is atomic with respect to readers,
+                # which keep lock-free plain dict lookups.
+                self.sessions = {**self.sessions, **registered}
+                for scheme, updates in scheme_updates.items():
+                    self._by_scheme[scheme] = {
+                        **self._by_scheme[scheme],
+                        **updates,
+                    }
+                self.available_tools = [*self.available_tools, *tools]
+                self.available_prompts = [*self.available_prompts, *prompts]
+                self.resource_count = sum(
+                    len(bucket) for bucket in self._by_scheme.values()
+                )
+                self.catalog_version += 1
 
             except Exception as e:
                 print(f"Error listing tools/prompts/resources for {server_name}: {e}")
@@ -354,8 +872,17 @@ class EnhancedMCPChatBot:
             with open("server_config.json", "r") as file:
                 data = json.load(file)
             servers = data.get("mcpServers", {})
-            for server_name, server_config in servers.items():
-                await self.connect_to_server(server_name, server_config)
+            # Servers are independent stdio processes - start them
+            # concurrently so startup latency is max(T) instead of sum(T).
+            # return_exceptions keeps one bad server from failing the rest;
+            # connect_to_server already logs its own errors.
+            await asyncio.gather(
+                *[
+                    self.connect_to_server(server_name, server_config)
+                    for server_name, server_config in servers.items()
+                ],
+                return_exceptions=True,
+            )
         except FileNotFoundError:
             print(
                 "Warning: server_config.json not found. No MCP servers will be connected."
@@ -411,82 +938,95 @@ class EnhancedMCPChatBot:
         command = parts[0].lower()
         current_session = self.memory.get_current_session()
 
-        try:
-            if command == "/sessions":
-                sessions = self.memory.list_sessions()
-                if not sessions:
-                    response = "No sessions found."
-                else:
-                    response = "📋 Chat Sessions:\n"
-                    for i, session in enumerate(sessions[:10], 1):
-                        current_marker = "👉 " if session["is_current"] else "   "
-                        response += f"{current_marker}{i}. {session['title']}\n"
-                        response += f"     ID: {session['id'][:8]}... | Messages: {session['message_count']} | Last: {session['last_activity']}\n"
-
-            elif command == "/new":
-                title = " ".join(parts[1:]) if len(parts) > 1 else None
-                session_id = self.memory.create_session(title)
-                response = (
-                    f"✅ Created new session: {self.memory.get_current_session().title}"
-                )
+        handler = self._cmd_table.get(command)
+        if handler is None:
+            response = (
+                f"❌ Unknown command: {command}. Type '/help' for available commands."
+            )
+        else:
+            try:
+                result = await handler(parts)
+                if isinstance(result, dict):
+                    # /prompt hands off to a full chat turn
+                    return result
+                response = result
+            except Exception as e:
+                response = f"❌ Error processing command: {str(e)}"
 
-            elif command == "/switch":
-                if len(parts) < 2:
-                    response = "❌ Usage: /switch <session_id>"
-                else:
-                    session_id = parts[1]
-                    matching_sessions = [
-                        s
-                        for s in self.memory.sessions.keys()
-                        if s.startswith(session_id)
-                    ]
-                    if len(matching_sessions) == 1:
-                        if self.memory.switch_session(matching_sessions[0]):
-                            session = self.memory.get_current_session()
-                            response = f"✅ Switched to: {session.title}"
-                        else:
-                            response = "❌ Failed to switch session"
-                    elif len(matching_sessions) > 1:
-                        response = f"❌ Multiple sessions match '{session_id}'. Be more specific."
-                    else:
-                        response = f"❌ Session '{session_id}' not found"
-
-            elif command == "/delete":
-                if len(parts) < 2:
-                    response = "❌ Usage: /delete <session_id>"
-                else:
-                    session_id = parts[1]
-                    matching_sessions = [
-                        s
-                        for s in self.memory.sessions.keys()
-                        if s.startswith(session_id)
-                    ]
-                    if len(matching_sessions) == 1:
-                        if self.memory.delete_session(matching_sessions[0]):
-                            response = "✅ Session deleted"
-                        else:
-                            response = "❌ Failed to delete session"
-                    else:
-                        response = f"❌ Session '{session_id}' not found or ambiguous"
-
-            elif command == "/clear":
-                self.memory.clear_current_session()
-                response = "✅ Current session cleared"
-
-            elif command == "/title":
-                if len(parts) < 2:
-                    response = "❌ Usage: /title <new_title>"
-                else:
-                    title = " ".join(parts[1:])
-                    self.memory.update_session_title(title)
-                    response = f"✅ Session title updated to: {title}"
-
-            elif command == "/stats":
-                stats = self.memory.get_session_stats()
-                if "error" in stats:
-                    response = f"❌ {stats['error']}"
-                else:
-                    response = f"""📊 Session Statistics:
+        return {
+            "response": response,
+            "session_id": current_session.id if current_session else None,
+            "session_title": current_session.title if current_session else None,
+            "tool_calls": [],
+            "timestamp": datetime.now().isoformat(),
+            "message_count": len(current_session.messages) if current_session else 0,
+            "command_type": "memory_command",
+        }
+
+    async def _cmd_sessions(self, parts: List[str]) -> str:
+        sessions = self.memory.list_sessions()
+        if not sessions:
+            return "No sessions found."
+
+        lines = ["📋 Chat Sessions:"]
+        for i, session in enumerate(sessions[:10], 1):
+            current_marker = "👉 " if session["is_current"] else "   "
+            lines.append(f"{current_marker}{i}. {session['title']}")
+            lines.append(
+                f"     ID: {session['id'][:8]}... | Messages: {session['message_count']} | Last: {session['last_activity']}"
+            )
+        return "\n".join(lines)
+
+    async def _cmd_new(self, parts: List[str]) -> str:
+        title = " ".join(parts[1:]) if len(parts) > 1 else None
+        self.memory.create_session(title)
+        return f"✅ Created new session: {self.memory.get_current_session().title}"
+
+    async def _cmd_switch(self, parts: List[str]) -> str:
+        if len(parts) < 2:
+            return "❌ Usage: /switch <session_id>"
+
+        session_id = parts[1]
+        matching_sessions = self.memory.find_sessions_by_prefix(session_id)
+        if len(matching_sessions) == 1:
+            if self.memory.switch_session(matching_sessions[0]):
+                session = self.memory.get_current_session()
+                return f"✅ Switched to: {session.title}"
+            return "❌ Failed to switch session"
+        elif len(matching_sessions) > 1:
+            return f"❌ Multiple sessions match '{session_id}'. Be more specific."
+        return f"❌ Session '{session_id}' not found"
+
+    async def _cmd_delete(self, parts: List[str]) -> str:
+        if len(parts) < 2:
+            return "❌ Usage: /delete <session_id>"
+
+        session_id = parts[1]
+        matching_sessions = self.memory.find_sessions_by_prefix(session_id)
+        if len(matching_sessions) == 1:
+            if self.memory.delete_session(matching_sessions[0]):
+                return "✅ Session deleted"
+            return "❌ Failed to delete session"
+        return f"❌ Session '{session_id}' not found or ambiguous"
+
+    async def _cmd_clear(self, parts: List[str]) -> str:
+        self.memory.clear_current_session()
+        return "✅ Current session cleared"
+
+    async def _cmd_title(self, parts: List[str]) -> str:
+        if len(parts) < 2:
+            return "❌ Usage: /title <new_title>"
+
+        title = " ".join(parts[1:])
+        self.memory.update_session_title(title)
+        return f"✅ Session title updated to: {title}"
+
+    async def _cmd_stats(self, parts: List[str]) -> str:
+        stats = self.memory.get_session_stats()
+        if "error" in stats:
+            return f"❌ {stats['error']}"
+
+        return f"""📊 Session Statistics:
     Title: {stats["title"]}
     Total Messages: {stats["total_messages"]}
     User Messages: {stats["user_messages"]}
@@ -495,114 +1035,81 @@ class EnhancedMCPChatBot:
     Created: {stats["created_at"]}
     Duration: {stats["duration"]}"""
 
-            elif command == "/history":
-                limit = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 5
-                session = self.memory.get_current_session()
-                if session:
-                    response = f"📜 Last {limit} messages:\n"
-                    for msg in session.messages[-limit:]:
-                        role_emoji = {
-                            "user": "👤",
-                            "assistant": "🤖",
-                            "tool": "🔧",
-                        }.get(msg.role.value, "❓")
-                        timestamp = msg.timestamp.strftime("%H:%M:%S")
-                        content_preview = msg.content[:100] + (
-                            "..." if len(msg.content) > 100 else ""
-                        )
-                        response += f"{role_emoji} [{timestamp}] {content_preview}\n"
-                else:
-                    response = "❌ No active session"
-
-            elif command == "/tools":
-                if self.available_tools:
-                    response = f"🔧 Available Tools ({len(self.available_tools)}):\n"
-                    for tool in self.available_tools:
-                        func = tool["function"]
-                        response += f"- {func['name']}: {func['description']}\n"
-                else:
-                    response = "No tools available."
+    async def _cmd_history(self, parts: List[str]) -> str:
+        limit = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 5
+        session = self.memory.get_current_session()
+        if not session:
+            return "❌ No active session"
 
-            elif command == "/resources":
-                resources = self.get_available_resources()
-                if not any(resources.values()):
-                    response = "No resources available."
-                else:
-                    response = "📚 Available resources:\n"
-                    if resources["gmail"]:
-                        response += "\n📧 Gmail resources:\n"
-                        response += (
-                            "- meeting-emails: Get recent meeting-related emails\n"
-                        )
-                        response += "- processed-meetings: Get processed meeting data\n"
-                        response += "- meeting-emails/{email_id}: Get specific meeting email by ID\n"
-
-                    if resources["project"]:
-                        response += "\n📋 Project resources:\n"
-                        response += "- info: Get project information from the knowledge repository\n"
-                        response += "- feature-updates: Get feature updates from the knowledge repository\n"
-                        response += "- status: Get project status from the knowledge repository\n"
-
-                    if resources["company"]:
-                        response += "\n🏢 Company resources:\n"
-                        response += "- info: Get company information from the knowledge repository\n"
-                        response += "- solution-info: Get solution information from the knowledge repository\n"
-                        response += "- all-info: Get all company information from the knowledge repository\n"
-                        response += "- docs: Get company documents from the knowledge repository\n"
-
-            elif command == "/prompts":
-                if self.available_prompts:
-                    response = "💡 Available prompts:\n"
-                    for prompt in self.available_prompts:
-                        response += f"- {prompt['name']}: {prompt['description']}\n"
-                        if prompt["arguments"]:
-                            response += "  Arguments:\n"
-                            for arg in prompt["arguments"]:
-                                arg_name = (
-                                    arg.name
-                                    if hasattr(arg, "name")
-                                    else arg.get("name", "")
-                                )
-                                response += f"    - {arg_name}\n"
-                else:
-                    response = "No prompts available."
+        lines = [f"📜 Last {limit} messages:"]
+        for msg in session.messages[-limit:]:
+            role_emoji = _ROLE_EMOJI.get(msg.role.value, "❓")
+            timestamp = datetime.fromtimestamp(msg.timestamp).strftime("%H:%M:%S")
+            content_preview = msg.content[:100] + (
+                "..." if len(msg.content) > 100 else ""
+            )
+            lines.append(f"{role_emoji} [{timestamp}] {content_preview}")
+        return "\n".join(lines)
+
+    async def _cmd_tools(self, parts: List[str]) -> str:
+        if not self.available_tools:
+            return "No tools available."
+
+        lines = [f"🔧 Available Tools ({len(self.available_tools)}):"]
+        for tool in self.available_tools:
+            func = tool["function"]
+            lines.append(f"- {func['name']}: {func['description']}")
+        return "\n".join(lines)
+
+    async def _cmd_resources(self, parts: List[str]) -> str:
+        resources = self.get_available_resources()
+        if not any(resources.values()):
+            return "No resources available."
+
+        blocks = ["📚 Available resources:\n"]
+        if resources["gmail"]:
+            blocks.append(_GMAIL_RESOURCES_TEXT)
+        if resources["project"]:
+            blocks.append(_PROJECT_RESOURCES_TEXT)
+        if resources["company"]:
+            blocks.append(_COMPANY_RESOURCES_TEXT)
+        return "".join(blocks)
+
+    async def _cmd_prompts(self, parts: List[str]) -> str:
+        if not self.available_prompts:
+            return "No prompts available."
+
+        lines = ["💡 Available prompts:"]
+        for prompt in self.available_prompts:
+            lines.append(f"- {prompt['name']}: {prompt['description']}")
+            if prompt["arguments"]:
+                lines.append("  Arguments:")
+                for arg in prompt["arguments"]:
+                    arg_name = (
+                        arg.name if hasattr(arg, "name") else arg.get("name", "")
+                    )
+                    lines.append(f"    - {arg_name}")
+        return "\n".join(lines)
 
-            elif command == "/prompt":
-                if len(parts) < 2:
-                    response = "❌ Usage: /prompt <name> <arg1=value1> <arg2=value2>"
-                else:
-                    prompt_name = parts[1]
-                    args = {}
-                    for arg in parts[2:]:
-                        if "=" in arg:
-                            key, value = arg.split("=", 1)
-                            args[key] = value
-
-                    result = await self.execute_prompt(prompt_name, args)
-                    if result["success"]:
-                        # Process the prompt result as a chat query
-                        return await self._process_chat_query(result["result"])
-                    else:
-                        response = f"❌ Error executing prompt: {result.get('error', 'Unknown error')}"
-
-            elif command == "/help":
-                response = self._get_help_text()
+    async def _cmd_prompt(self, parts: List[str]):
+        if len(parts) < 2:
+            return "❌ Usage: /prompt <name> <arg1=value1> <arg2=value2>"
 
-            else:
-                response = f"❌ Unknown command: {command}. Type '/help' for available commands."
+        prompt_name = parts[1]
+        args = {}
+        for arg in parts[2:]:
+            if "=" in arg:
+                key, value = arg.split("=", 1)
+                args[key] = value
 
-        except Exception as e:
-            response = f"❌ Error processing command: {str(e)}"
+        result = await self.execute_prompt(prompt_name, args)
+        if result["success"]:
+            # Process the prompt result as a chat query
+            return await self._process_chat_query(result["result"])
+        return f"❌ Error executing prompt: {result.get('error', 'Unknown error')}"
 
-        return {
-            "response": response,
-            "session_id": current_session.id if current_session else None,
-            "session_title": current_session.title if current_session else None,
-            "tool_calls": [],
-            "timestamp": datetime.now().isoformat(),
-            "message_count": len(current_session.messages) if current_session else 0,
-            "command_type": "memory_command",
-        }
+    async def _cmd_help(self, parts: List[str]) -> str:
+        return self._get_help_text()
 
     async def _handle_resource_commands(self, query: str) -> Dict[str, Any]:
         """Handle resource commands"""
@@ -638,220 +1145,199 @@ class EnhancedMCPChatBot:
         """Parse @resource command and return appropriate URI"""
         resource_identifier = query[1:]
 
-        # Gmail resources
-        if resource_identifier == "meeting-emails":
-            return "gmail://meeting-emails"
-        elif resource_identifier == "processed-meetings":
-            return "gmail://processed-meetings"
-        elif resource_identifier.startswith("meeting-emails/"):
-            email_id = resource_identifier.split("/", 1)[1]
-            return f"gmail://meeting-emails/{email_id}"
-
-        # Project resources
-        elif resource_identifier == "project-info":
-            return "project://info"
-        elif resource_identifier == "feature-updates":
-            return "project://feature-updates"
-        elif resource_identifier == "project-status":
-            return "project://status"
-
-        # Company resources
-        elif resource_identifier == "company-info":
-            return "company://info"
-        elif resource_identifier == "solution-info":
-            return "company://solution-info"
-        elif resource_identifier == "company-all-info":
-            return "company://all-info"
-        elif resource_identifier == "company-docs":
-            return "company://docs"
+        uri = _RESOURCE_MAP.get(resource_identifier)
+        if uri:
+            return uri
+
+        # Parameterized Gmail resource: @meeting-emails/<email_id>
+        if resource_identifier.startswith("meeting-emails/"):
+            return f"gmail://{resource_identifier}"
 
         return None
 
     def _get_help_text(self) -> str:
         """Return help text"""
-        return """🤖 ENHANCED MCP CHATBOT - HELP
-    ════════════════════════════════════════════════════════════
+        return _HELP_TEXT
 
-    📝 MEMORY COMMANDS:
-    /sessions          - List all chat sessions
-    /new [title]       - Create new session
-    /switch <id>       - Switch to session
-    /delete <id>       - Delete session
-    /clear             - Clear current session
-    /title <title>     - Set session title
-    /stats             - Show session statistics
-    /history [n]       - Show last n messages
+    async def process_query_stream(self, query: str, session_id: Optional[str] = None):
+        """Process a query, streaming the response.
 
-    📚 RESOURCE COMMANDS:
-    @meeting-emails           - Get recent meeting emails
-    @processed-meetings       - Get processed meeting data
-    @meeting-emails/<id>      - Get specific meeting email
-    @project-info             - Get project information
-    @feature-updates          - Get feature updates
-    @project-status           - Get project status
-    @company-info             - Get company information
-    @solution-info            - Get solution information
-    @company-all-info         - Get all company info
-    @company-docs             - Get company documents
+        Yields ("delta", text) as the model generates content, then one
+        ("end", payload) where payload is the same dict process_query
+        returns. Commands and resource queries produce no deltas.
+        """
+        if not self._initialized:
+            await self.initialize()
 
-    🔧 SYSTEM COMMANDS:
-    /resources         - List available resources
-    /prompts           - List available prompts
-    /prompt <name>     - Execute a prompt
-    /tools             - List available tools
-    /help              - Show this help
+        if session_id:
+            if not self.memory.switch_session(session_id):
+                raise ValueError(f"Session {session_id} not found")
+        elif not self.memory.current_session_id:
+            self.memory.create_session()
 
-    💬 CHAT:
-    Just type your message to chat normally!
-    ════════════════════════════════════════════════════════════"""
+        query = query.strip()
+        if not query or query.startswith(("/", "@")):
+            # Non-chat paths return in one piece; session handling above
+            # already happened, so don't pass session_id again.
+            yield ("end", await self.process_query(query))
+            return
+
+        async for item in self._stream_chat_query(query):
+            yield item
 
     async def _process_chat_query(self, query: str) -> Dict[str, Any]:
-        """Process a regular chat query (the original process_query logic)"""
+        """Run a chat query to completion and return only the final payload."""
+        result: Dict[str, Any] = {}
+        async for kind, payload in self._stream_chat_query(query):
+            if kind == "end":
+                result = payload
+        return result
+
+    async def _stream_chat_query(self, query: str):
+        """Process a regular chat query (the original process_query logic),
+        yielding ("delta", text) per streamed chunk and ("end", payload)."""
         # Add user message to memory
         user_message = ChatMessage(
-            id=str(uuid.uuid4()),
+            id=_new_message_id(),
             role=MessageRole.USER,
             content=query,
-            timestamp=datetime.now(),
+            timestamp=time.time(),
         )
         self.memory.add_message(user_message)
 
-        # Get conversation history
-        messages = self.memory.get_conversation_history(limit=10)
-        messages.append({"role": "user", "content": query})
+        # Get conversation history (cached list; copy before appending)
+        messages = [
+            *self.memory.get_conversation_history(limit=10),
+            {"role": "user", "content": query},
+        ]
 
-        assistant_responses = []
+        # Incremental buffer; avoids re-walking a segment list at return time
+        response_buf = io.StringIO()
         tool_calls_made = []
         process_query = True
+        # Bind the loop's hottest lookups to locals once; each use inside the
+        # loop is then a single LOAD_FAST instead of two attribute lookups.
+        add_message = self.memory.add_message
+        append_entry = messages.append
+        append_tool_info = tool_calls_made.append
+        # Same (tool, args) failing repeatedly means the model is stuck in a
+        # retry loop; every retry reappends history, so abort early.
+        turn_errors: Counter = Counter()
 
         while process_query:
             try:
-                response = self.openai.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    tools=self.available_tools if self.available_tools else None,
-                    tool_choice="auto" if self.available_tools else None,
-                    max_tokens=2024,
+                # Stream the completion so the event loop stays free for
+                # other sessions and the debounced flusher between chunks.
+                stream = await self._llm_batcher.submit(
+                    dict(
+                        model="gpt-4o-mini",
+                        messages=messages,
+                        tools=self.available_tools if self.available_tools else None,
+                        tool_choice="auto" if self.available_tools else None,
+                        max_tokens=2024,
+                        stream=True,
+                    )
                 )
 
-                response_message = response.choices[0].message
+                content_parts = []
+                tool_call_parts: Dict[int, Dict[str, Any]] = {}
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield ("delta", delta.content)
+                    if delta.tool_calls:
+                        for tc in delta.tool_calls:
+                            acc = tool_call_parts.setdefault(
+                                tc.index,
+                                {
+                                    "id": "",
+                                    "type": "function",
+                                    "function": {"name": "", "arguments": ""},
+                                },
+                            )
+                            if tc.id:
+                                acc["id"] = tc.id
+                            if tc.function:
+                                if tc.function.name:
+                                    acc["function"]["name"] += tc.function.name
+                                if tc.function.arguments:
+                                    acc["function"]["arguments"] += (
+                                        tc.function.arguments
+                                    )
+
+                response_content = "".join(content_parts)
+                tool_calls = (
+                    [acc for _, acc in sorted(tool_call_parts.items())]
+                    if tool_call_parts
+                    else None
+                )
+
+                # One clock read per iteration, shared by the assistant
+                # message and every tool result it triggers.
+                now = time.time()
 
                 # Add assistant message to memory
                 assistant_message = ChatMessage(
-                    id=str(uuid.uuid4()),
+                    id=_new_message_id(),
                     role=MessageRole.ASSISTANT,
-                    content=response_message.content or "",
-                    timestamp=datetime.now(),
-                    tool_calls=[
-                        {
-                            "id": tc.id,
-                            "type": tc.type,
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
-                        }
-                        for tc in response_message.tool_calls
-                    ]
-                    if response_message.tool_calls
-                    else None,
+                    content=response_content,
+                    timestamp=now,
+                    tool_calls=tool_calls,
                 )
-                self.memory.add_message(assistant_message)
-
-                messages.append(response_message.model_dump())
-
-                if response_message.content:
-                    assistant_responses.append(response_message.content)
-
-                if response_message.tool_calls:
-                    for tool_call in response_message.tool_calls:
-                        tool_name = tool_call.function.name
-                        tool_args = json.loads(tool_call.function.arguments)
-                        tool_id = tool_call.id
-
-                        tool_call_info = {
-                            "tool_name": tool_name,
-                            "tool_args": tool_args,
-                            "tool_id": tool_id,
-                            "success": False,
-                            "result": None,
-                            "error": None,
-                        }
-
-                        session = self.sessions.get(tool_name)
+                add_message(assistant_message)
 
-                        if not session:
-                            error_msg = f"Tool '{tool_name}' not found."
-                            tool_call_info["error"] = error_msg
-
-                            tool_result = ChatMessage(
-                                id=str(uuid.uuid4()),
-                                role=MessageRole.TOOL,
-                                content=error_msg,
-                                timestamp=datetime.now(),
-                                tool_call_id=tool_id,
+                assistant_entry = {
+                    "role": "assistant",
+                    "content": response_content or None,
+                }
+                if tool_calls:
+                    assistant_entry["tool_calls"] = tool_calls
+                append_entry(assistant_entry)
+
+                if response_content:
+                    response_buf.write(response_content)
+                    response_buf.write("\n")
+
+                if tool_calls:
+                    # Independent network calls - dispatch them concurrently,
+                    # then apply results in emission order so memory and the
+                    # OpenAI message list stay deterministic. Duplicate calls
+                    # (same tool, same canonical args) within the batch share
+                    # one in-flight RPC via the inflight map. _dispatch_tool_call
+                    # captures tool errors itself, so the TaskGroup only
+                    # propagates genuinely unexpected failures and cancels any
+                    # siblings still running when one occurs.
+                    inflight: Dict[Tuple[str, bytes], asyncio.Future] = {}
+                    async with asyncio.TaskGroup() as tg:
+                        tasks = [
+                            tg.create_task(
+                                self._dispatch_tool_call(tc, now, inflight)
                             )
-                            self.memory.add_message(tool_result)
-
-                            messages.append(
-                                {
-                                    "role": "tool",
-                                    "tool_call_id": tool_id,
-                                    "content": error_msg,
-                                }
+                            for tc in tool_calls
+                        ]
+                    for tool_call_info, tool_result, messages_entry in (
+                        task.result() for task in tasks
+                    ):
+                        add_message(tool_result)
+                        append_entry(messages_entry)
+                        append_tool_info(tool_call_info)
+                        if tool_call_info["error"]:
+                            err_key = (
+                                tool_call_info["tool_name"],
+                                _canon_enc.encode(tool_call_info["tool_args"]),
                             )
-                        else:
-                            try:
-                                result = await session.call_tool(
-                                    tool_name, arguments=tool_args
-                                )
-                                tool_content = (
-                                    result.content
-                                    if hasattr(result, "content")
-                                    else str(result)
-                                )
-
-                                tool_call_info["success"] = True
-                                tool_call_info["result"] = tool_content
-
-                                tool_result = ChatMessage(
-                                    id=str(uuid.uuid4()),
-                                    role=MessageRole.TOOL,
-                                    content=tool_content,
-                                    timestamp=datetime.now(),
-                                    tool_call_id=tool_id,
-                                )
-                                self.memory.add_message(tool_result)
-
-                                messages.append(
+                            turn_errors[err_key] += 1
+                            if turn_errors[err_key] > 2:
+                                append_entry(
                                     {
-                                        "role": "tool",
-                                        "tool_call_id": tool_id,
-                                        "content": tool_content,
+                                        "role": "system",
+                                        "content": "aborting: repeated tool failure",
                                     }
                                 )
-                            except Exception as e:
-                                error_msg = f"Error calling tool {tool_name}: {str(e)}"
-                                tool_call_info["error"] = error_msg
-
-                                tool_result = ChatMessage(
-                                    id=str(uuid.uuid4()),
-                                    role=MessageRole.TOOL,
-                                    content=error_msg,
-                                    timestamp=datetime.now(),
-                                    tool_call_id=tool_id,
-                                )
-                                self.memory.add_message(tool_result)
-
-                                messages.append(
-                                    {
-                                        "role": "tool",
-                                        "tool_call_id": tool_id,
-                                        "content": error_msg,
-                                    }
-                                )
-
-                        tool_calls_made.append(tool_call_info)
+                                process_query = False
                 else:
                     process_query = False
 
@@ -860,18 +1346,111 @@ class EnhancedMCPChatBot:
 
         # Get current session info
         current_session = self.memory.get_current_session()
+        self.memory.flush_pending()
 
-        return {
-            "response": "\n".join(assistant_responses)
-            if assistant_responses
-            else "Query processed successfully",
-            "session_id": current_session.id if current_session else None,
-            "session_title": current_session.title if current_session else None,
-            "tool_calls": tool_calls_made,
-            "timestamp": datetime.now().isoformat(),
-            "message_count": len(current_session.messages) if current_session else 0,
-            "command_type": "chat",
+        yield (
+            "end",
+            {
+                "response": response_buf.getvalue().rstrip("\n")
+                or "Query processed successfully",
+                "session_id": current_session.id if current_session else None,
+                "session_title": current_session.title
+                if current_session
+                else None,
+                "tool_calls": tool_calls_made,
+                "timestamp": datetime.now().isoformat(),
+                "message_count": len(current_session.messages)
+                if current_session
+                else 0,
+                "command_type": "chat",
+            },
+        )
+
+    async def _dispatch_tool_call(
+        self,
+        tool_call: Dict[str, Any],
+        now: float,
+        inflight: Dict[Tuple[str, bytes], asyncio.Future],
+    ) -> Tuple[Dict[str, Any], ChatMessage, Dict[str, Any]]:
+        """Execute one tool call and return its info dict, memory message
+        and OpenAI messages entry without touching shared state."""
+        tool_name = tool_call["function"]["name"]
+        arguments = tool_call["function"]["arguments"]
+        # Some providers hand back already-parsed arguments
+        tool_args = (
+            msgspec.json.decode(arguments)
+            if isinstance(arguments, (str, bytes))
+            else arguments
+        )
+        tool_id = tool_call["id"]
+
+        tool_call_info = _TOOL_INFO_TEMPLATE.copy()
+        tool_call_info["tool_name"] = tool_name
+        tool_call_info["tool_args"] = tool_args
+        tool_call_info["tool_id"] = tool_id
+
+        session = self.sessions.get(tool_name)
+
+        if not session:
+            tool_content = f"Tool '{tool_name}' not found."
+            tool_call_info["error"] = tool_content
+        else:
+            try:
+                # Models sometimes emit the same call twice in one batch;
+                # keying on (name, canonical args) makes the duplicates
+                # await the first call's task instead of re-hitting the
+                # server. Each duplicate still gets its own result message.
+                key = (tool_name, _canon_enc.encode(tool_args))
+                call = inflight.get(key)
+                if call is None:
+                    call = asyncio.ensure_future(
+                        session.call_tool(tool_name, arguments=tool_args)
+                    )
+                    inflight[key] = call
+                result = await call
+                content = result.content if hasattr(result, "content") else result
+                # MCP hands back a list of content blocks (TextContent
+                # etc.); flatten to plain text here so the result stays a
+                # str end to end — msgspec encoding, the JSONL log and the
+                # prompt truncation below all assume str content.
+                if isinstance(content, list):
+                    tool_content = "\n".join(
+                        item.text if isinstance(item, TextContent) else str(item)
+                        for item in content
+                    )
+                elif isinstance(content, str):
+                    tool_content = content
+                else:
+                    tool_content = str(content)
+                tool_call_info["success"] = True
+                tool_call_info["result"] = tool_content
+            except Exception as e:
+                tool_content = f"Error calling tool {tool_name}: {str(e)}"
+                tool_call_info["error"] = tool_content
+
+        tool_result = ChatMessage(
+            id=_new_message_id(),
+            role=MessageRole.TOOL,
+            content=tool_content,
+            timestamp=now,
+            tool_call_id=tool_id,
+        )
+        # Cap only the copy that goes back into the model's context; memory
+        # and tool_call_info keep the full result.
+        prompt_content = tool_content
+        if (
+            isinstance(prompt_content, str)
+            and len(prompt_content) > _MAX_TOOL_RESULT_CHARS
+        ):
+            prompt_content = (
+                prompt_content[:_MAX_TOOL_RESULT_CHARS] + "... [truncated]"
+            )
+        messages_entry = {
+            "role": "tool",
+            "tool_call_id": tool_id,
+            "content": prompt_content,
         }
+        return tool_call_info, tool_result, messages_entry
 
     async def get_resource(self, resource_uri: str) -> Dict[str, Any]:
         """Get a resource and return the content"""
@@ -880,38 +1459,28 @@ class EnhancedMCPChatBot:
 
         session = self.sessions.get(resource_uri)
 
-        # Fallback logic for different resource types
+        # Fallback: any session serving the same URI scheme
         if not session:
-            for uri, sess in self.sessions.items():
-                if (
-                    (resource_uri.startswith("gmail://") and uri.startswith("gmail://"))
-                    or (
-                        resource_uri.startswith("project://")
-                        and uri.startswith("project://")
-                    )
-                    or (
-                        resource_uri.startswith("company://")
-                        and uri.startswith("company://")
-                    )
-                ):
-                    session = sess
-                    break
+            scheme = resource_uri.split("://", 1)[0]
+            session = next(iter(self._by_scheme.get(scheme, {}).values()), None)
 
         if not session:
             raise ValueError(f"Resource '{resource_uri}' not found")
 
         try:
             result = await session.read_resource(uri=resource_uri)
-            content_list = []
 
             if result and result.contents:
-                for content in result.contents:
-                    if hasattr(content, "text"):
-                        content_list.append(content.text)
-                    else:
-                        content_list.append(str(content))
+                # One C-level isinstance per item instead of hasattr's
+                # try/except attribute probe; resource bodies can be long.
+                content_list = [
+                    content.text
+                    if isinstance(content, TextResourceContents)
+                    else str(content)
+                    for content in result.contents
+                ]
             else:
-                content_list.append("No content available.")
+                content_list = ["No content available."]
 
             return {
                 "resource_uri": resource_uri,
@@ -949,11 +1518,11 @@ class EnhancedMCPChatBot:
                 # Extract text from content
                 if isinstance(prompt_content, str):
                     text_content = prompt_content
-                elif hasattr(prompt_content, "text"):
+                elif isinstance(prompt_content, TextContent):
                     text_content = prompt_content.text
                 else:
                     text_content = " ".join(
-                        item.text if hasattr(item, "text") else str(item)
+                        item.text if isinstance(item, TextContent) else str(item)
                         for item in prompt_content
                     )
 
@@ -993,22 +1562,13 @@ class EnhancedMCPChatBot:
 
     def get_available_resources(self) -> Dict[str, List[str]]:
         """Return available resources grouped by type"""
-        gmail_resources = [
-            uri for uri in self.sessions.keys() if uri.startswith("gmail://")
-        ]
-        project_resources = [
-            uri for uri in self.sessions.keys() if uri.startswith("project://")
-        ]
-        company_resources = [
-            uri for uri in self.sessions.keys() if uri.startswith("company://")
-        ]
-
         return {
-            "gmail": gmail_resources,
-            "project": project_resources,
-            "company": company_resources,
+            scheme: list(bucket.keys())
+            for scheme, bucket in self._by_scheme.items()
         }
 
     async def cleanup(self):
         """Cleanup resources"""
+        self.memory.flush()
+        await self._http.aclose()
         await self.exit_stack.aclose()
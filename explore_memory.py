@@ -1,22 +1,53 @@
 #!/usr/bin/env python3
 """
-Script to explore the chat_memory.pkl file contents
+Script to explore the session store (sessions_index.msgpack + per-session
+JSONL logs)
 """
 
-import json
-import pickle
+import os
 from datetime import datetime
 from pprint import pprint
 
+import msgspec
 
-def explore_pickle_file(filename="chat_memory.pkl"):
-    """Explore the contents of the pickle file"""
+STORAGE_DIR = "sessions"
+INDEX_FILE = os.path.join(STORAGE_DIR, "sessions_index.msgpack")
+
+
+def _session_log_path(session_id):
+    return os.path.join(STORAGE_DIR, f"{session_id}.jsonl")
+
+
+def _iter_messages(session_id):
+    """Stream one session's messages without loading the whole log."""
+    log_path = _session_log_path(session_id)
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, "rb") as f:
+        for line in f:
+            yield msgspec.json.decode(line)
+
+
+def _count_messages(session_id):
+    log_path = _session_log_path(session_id)
+    if not os.path.exists(log_path):
+        return 0
+    with open(log_path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def _format_ts(ts, fmt="%Y-%m-%d %H:%M:%S"):
+    return datetime.fromtimestamp(ts).strftime(fmt)
+
+
+def explore_session_index(index_file=INDEX_FILE):
+    """Explore the contents of the session index"""
     try:
-        print(f"🔍 Exploring {filename}...")
+        print(f"🔍 Exploring {index_file}...")
         print("=" * 50)
 
-        with open(filename, "rb") as f:
-            data = pickle.load(f)
+        with open(index_file, "rb") as f:
+            data = msgspec.msgpack.decode(f.read())
 
         print("📊 TOP-LEVEL STRUCTURE:")
         print(f"Type: {type(data)}")
@@ -30,23 +61,24 @@ def explore_pickle_file(filename="chat_memory.pkl"):
         print()
 
         # Show sessions overview
-        sessions = data.get("sessions", {})
+        sessions = data.get("sessions", [])
         print(f"📋 SESSIONS OVERVIEW ({len(sessions)} total):")
         print("-" * 30)
 
-        for i, (session_id, session_data) in enumerate(sessions.items(), 1):
+        for i, session_data in enumerate(sessions, 1):
+            session_id = session_data["id"]
             is_current = "👉 CURRENT" if session_id == current_session_id else ""
             print(f"{i}. {session_data['title']} {is_current}")
             print(f"   ID: {session_id}")
-            print(f"   Created: {session_data['created_at']}")
-            print(f"   Last Activity: {session_data['last_activity']}")
-            print(f"   Messages: {len(session_data['messages'])}")
+            print(f"   Created: {_format_ts(session_data['created_at'])}")
+            print(f"   Last Activity: {_format_ts(session_data['last_activity'])}")
+            print(f"   Messages: {_count_messages(session_id)}")
             print()
 
         return data
 
     except FileNotFoundError:
-        print(f"❌ File {filename} not found")
+        print(f"❌ File {index_file} not found")
         return None
     except Exception as e:
         print(f"❌ Error reading file: {e}")
@@ -54,35 +86,34 @@ def explore_pickle_file(filename="chat_memory.pkl"):
 
 
 def explore_session_details(data, session_index=1):
-    """Explore details of a specific session"""
-    sessions = data.get("sessions", {})
-    session_items = list(sessions.items())
+    """Explore details of a specific session, streaming its message log"""
+    sessions = data.get("sessions", [])
 
-    if session_index > len(session_items):
-        print(f"❌ Session index {session_index} out of range (1-{len(session_items)})")
+    if session_index > len(sessions):
+        print(f"❌ Session index {session_index} out of range (1-{len(sessions)})")
         return
 
-    session_id, session_data = session_items[session_index - 1]
+    session_data = sessions[session_index - 1]
+    session_id = session_data["id"]
 
     print(f"🔎 DETAILED VIEW - SESSION {session_index}")
     print("=" * 50)
     print(f"Title: {session_data['title']}")
     print(f"ID: {session_id}")
-    print(f"Created: {session_data['created_at']}")
-    print(f"Last Activity: {session_data['last_activity']}")
+    print(f"Created: {_format_ts(session_data['created_at'])}")
+    print(f"Last Activity: {_format_ts(session_data['last_activity'])}")
     print(f"Context: {session_data.get('context', {})}")
     print()
 
-    messages = session_data["messages"]
-    print(f"💬 MESSAGES ({len(messages)} total):")
+    print(f"💬 MESSAGES ({_count_messages(session_id)} total):")
     print("-" * 30)
 
-    for i, msg in enumerate(messages, 1):
+    for i, msg in enumerate(_iter_messages(session_id), 1):
         role_emoji = {"user": "👤", "assistant": "🤖", "tool": "🔧", "system": "⚙️"}.get(
             msg["role"], "❓"
         )
 
-        timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M:%S")
+        timestamp = _format_ts(msg["timestamp"], "%H:%M:%S")
         content_preview = msg["content"][:100] + (
             "..." if len(msg["content"]) > 100 else ""
         )
@@ -102,10 +133,32 @@ def explore_session_details(data, session_index=1):
 
 
 def export_to_json(data, output_file="chat_memory_export.json"):
-    """Export pickle data to JSON for easier viewing"""
+    """Export the session store to JSON, streaming one session at a time.
+
+    The log lines are already JSON, so they are copied into the output
+    verbatim; no session's messages are ever fully materialized in memory.
+    """
     try:
-        with open(output_file, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        with open(output_file, "wb") as f:
+            f.write(b'{"current_session_id":')
+            f.write(msgspec.json.encode(data.get("current_session_id")))
+            f.write(b',"sessions":{')
+            for i, session_data in enumerate(data.get("sessions", [])):
+                if i:
+                    f.write(b",")
+                f.write(msgspec.json.encode(session_data["id"]))
+                f.write(b':{"meta":')
+                f.write(msgspec.json.encode(session_data))
+                f.write(b',"messages":[')
+                log_path = _session_log_path(session_data["id"])
+                if os.path.exists(log_path):
+                    with open(log_path, "rb") as log:
+                        for j, line in enumerate(log):
+                            if j:
+                                f.write(b",")
+                            f.write(line.rstrip(b"\n"))
+                f.write(b"]}")
+            f.write(b"}}")
         print(f"✅ Exported to {output_file}")
     except Exception as e:
         print(f"❌ Error exporting: {e}")
@@ -116,13 +169,13 @@ def main():
     print("🧠 CHAT MEMORY EXPLORER")
     print("=" * 50)
 
-    # Load and explore the pickle file
-    data = explore_pickle_file()
+    # Load and explore the session index
+    data = explore_session_index()
 
     if not data:
         return
 
-    sessions = data.get("sessions", {})
+    sessions = data.get("sessions", [])
     if not sessions:
         print("No sessions found in the file.")
         return
@@ -139,7 +192,7 @@ def main():
         choice = input("\nEnter choice (1-5, default=1): ").strip() or "1"
 
         if choice == "1":
-            explore_pickle_file()
+            explore_session_index()
 
         elif choice == "2":
             session_num = input(f"Enter session number (1-{len(sessions)}): ").strip()
@@ -3,8 +3,12 @@ Enhanced MCP ChatBot API Server
 Main entry point for the FastAPI application with organized structure.
 """
 
+import os
+
+import msgspec
 import uvicorn
 from fastapi import WebSocket
+from fastapi.responses import Response
 
 from src.api.legacy import legacy_router
 from src.api.routes import api_router
@@ -24,10 +28,9 @@ app.include_router(legacy_router)
 websocket_manager = WebSocketManager()
 
 
-@app.get("/")
-async def root():
-    """Root endpoint with API information"""
-    return {
+# Serialized once at import; the handler returns the same bytes every hit
+_ROOT_BYTES = msgspec.json.encode(
+    {
         "name": "Enhanced MCP ChatBot API",
         "version": "2.0.0",
         "status": "running",
@@ -50,6 +53,13 @@ async def root():
             "health": "GET /api/v1/health",
         },
     }
+)
+
+
+@app.get("/")
+async def root():
+    """Root endpoint with API information"""
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 
 @app.websocket("/ws")
@@ -59,4 +69,36 @@ async def websocket_chat(websocket: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", port=8000, reload=True, log_level="info")
+    if os.getenv("ENV") == "prod":
+        # One worker by default: every worker builds its own MemoryManager
+        # over the same sessions/ directory, and concurrent index rewrites
+        # and cleanup unlinks corrupt the shared store. Raise
+        # WEB_CONCURRENCY only once session storage is shared (or each
+        # worker gets its own storage dir).
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools",
+            ws="websockets",
+            ws_per_message_deflate=True,
+            timeout_keep_alive=75,
+            log_level="warning",
+        )
+    else:
+        # uvloop + httptools give C-level event loop and HTTP parsing; a
+        # single worker because sessions and MCP connections live in
+        # process memory.
+        uvicorn.run(
+            "main:app",
+            port=8000,
+            reload=False,
+            loop="uvloop",
+            http="httptools",
+            ws="websockets",
+            ws_per_message_deflate=True,
+            timeout_keep_alive=75,
+            log_level="info",
+        )
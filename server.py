@@ -1,27 +1,84 @@
 import asyncio
-import json
 import logging
+import os
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import msgspec
 import uvicorn
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field, ValidationError
 
 # Import the enhanced MCP client
-from enhanced_mcp_client import EnhancedMCPChatBot
+from enhanced_mcp_client import ConversationSession, EnhancedMCPChatBot
+from src.api.chat import router as chat_router
+from src.core import config as src_config
+from src.core.clock import now_iso as _now_iso
+from src.models.schemas import SessionPagination
+from src.services.chatbot_service import ChatBotService
+
+# Use uvloop for any non-uvicorn entry into this module as well (uvicorn
+# itself is configured with loop="uvloop" below); unavailable on Windows.
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compiled once; reused for every response body and WebSocket frame
+_json_encoder = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSONResponse rendered by msgspec's C encoder instead of json.dumps."""
+
+    def render(self, content) -> bytes:
+        return _json_encoder.encode(content)
+
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+class MsgpackResponse(Response):
+    """Binary msgpack rendering for clients that ask for it.
+
+    30-50% smaller than JSON for tool_calls/messages arrays and cheaper
+    for the client to parse; selected via Accept: application/x-msgpack.
+    """
+
+    media_type = "application/x-msgpack"
+
+    def render(self, content) -> bytes:
+        return _msgpack_encoder.encode(content)
+
+
+def _wants_msgpack(accept: Optional[str]) -> bool:
+    return bool(accept) and "application/x-msgpack" in accept
+
 
 # Pydantic models for API requests/responses
 class ChatRequest(BaseModel):
-    query: str
+    # Reject empty/oversized queries at the router boundary instead of
+    # discovering them after an LLM round-trip.
+    query: str = Field(min_length=1, max_length=32_000)
     session_id: Optional[str] = None
+    no_cache: bool = False
 
 
 class ChatResponse(BaseModel):
@@ -85,16 +142,44 @@ class MemoryStatsResponse(BaseModel):
 chatbot: Optional[EnhancedMCPChatBot] = None
 
 
+def get_session_or_404(session_id: str) -> ConversationSession:
+    """Resolve the {session_id} path parameter to a session, once.
+
+    Shared dependency for every /sessions/{session_id}/... endpoint so
+    the init check and 404 branch live in exactly one place.
+    """
+    if not chatbot:
+        raise HTTPException(status_code=503, detail="ChatBot not initialized")
+    session = chatbot.memory.sessions.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events using lifespan context manager"""
     global chatbot
 
+    background_tasks = []
+
     # Startup
     try:
         logger.info("🚀 Initializing Enhanced MCP ChatBot...")
         chatbot = EnhancedMCPChatBot()
         await chatbot.initialize()
+        # The /chat router lives in src/api/chat.py and resolves the bot
+        # through the service container; point it at this instance so the
+        # implementation exists in exactly one place.
+        src_config.chatbot_service = ChatBotService.from_chatbot(chatbot)
+        background_tasks.append(
+            asyncio.create_task(
+                src_config.session_cleanup_loop(src_config.chatbot_service)
+            )
+        )
+        background_tasks.append(
+            asyncio.create_task(src_config.chatbot_service.stats_snapshot_loop())
+        )
         logger.info("✅ Enhanced MCP ChatBot initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize chatbot: {e}")
@@ -103,8 +188,11 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
     if chatbot:
         await chatbot.cleanup()
+    src_config.chatbot_service = None
     logger.info("👋 FastAPI app shutdown and resources cleaned up")
 
 
@@ -116,6 +204,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=MsgspecJSONResponse,
 )
 
 # Add CORS middleware
@@ -127,11 +216,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Session histories can run to megabytes of JSON; gzip them on the way
+# out. Level 5 keeps the CPU cost small, and the 1 KiB floor leaves the
+# tiny static payloads untouched.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
-@app.get("/")
-async def root():
-    """Root endpoint with API information"""
-    return {
+# /chat is implemented once in src/api/chat.py; mount it here for the
+# legacy paths and again under the versioned prefix.
+app.include_router(chat_router)
+app.include_router(chat_router, prefix="/api/v1")
+
+
+# Constant bodies serialized once at import; the handlers just hand the
+# bytes to the response, which matters under CORS-preflight storms.
+_ROOT_BYTES = _json_encoder.encode(
+    {
         "name": "Enhanced MCP ChatBot API",
         "version": "2.0.0",
         "status": "running",
@@ -154,37 +253,27 @@ async def root():
             "health": "GET /health",
         },
     }
+)
+_OK_BYTES = b'{"message":"OK"}'
+
+# Everything in the welcome frame except the session info and timestamp
+# is constant; build that part once.
+_WELCOME_STATIC = {
+    "type": "welcome",
+    "message": "🤖 Connected to Enhanced MCP ChatBot",
+    "features": [
+        "chat",
+        "session_management",
+        "tool_calls",
+        "resources",
+    ],
+}
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """Send a chat message and get response with memory persistence"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    try:
-        result = await chatbot.process_query(request.query, request.session_id)
-
-        return ChatResponse(
-            response=result["response"],
-            session_id=result["session_id"],
-            session_title=result["session_title"],
-            tool_calls=result["tool_calls"],
-            timestamp=result["timestamp"],
-            message_count=result["message_count"],
-        )
-
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.options("/chat")
-async def chat_options():
-    """Handle CORS preflight for chat endpoint"""
-    return {"message": "OK"}
+@app.get("/")
+async def root():
+    """Root endpoint with API information"""
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 
 @app.post("/sessions")
@@ -200,7 +289,7 @@ async def create_session(request: SessionCreateRequest):
         return {
             "session_id": session_id,
             "title": session.title,
-            "created_at": session.created_at.isoformat(),
+            "created_at": datetime.fromtimestamp(session.created_at).isoformat(),
             "message": "✅ Session created successfully",
         }
     except Exception as e:
@@ -211,48 +300,50 @@ async def create_session(request: SessionCreateRequest):
 @app.options("/sessions")
 async def sessions_options():
     """Handle CORS preflight for sessions endpoint"""
-    return {"message": "OK"}
+    return Response(_OK_BYTES, media_type="application/json")
 
 
-@app.get("/sessions", response_model=List[SessionResponse])
-async def list_sessions():
-    """List all chat sessions with metadata"""
+@app.get("/sessions")
+def list_sessions(
+    pagination: SessionPagination = Depends(),
+    accept: Optional[str] = Header(None),
+):
+    """List chat sessions with metadata, one bounded page at a time"""
     if not chatbot:
         raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
     try:
-        sessions_data = chatbot.memory.list_sessions()
-        return [
-            SessionResponse(
-                id=session["id"],
-                title=session["title"],
-                created_at=session["created_at"],
-                last_activity=session["last_activity"],
-                message_count=session["message_count"],
-                is_current=session["is_current"],
-            )
-            for session in sessions_data
-        ]
+        total = len(chatbot.memory.sessions)
+        # memory.list_sessions() already returns response-shaped dicts
+        # (see SessionResponse); re-validating each row through Pydantic
+        # only to serialize it again is pure overhead on large listings.
+        rows = chatbot.memory.list_sessions(
+            limit=pagination.page_size, offset=pagination.page_offset
+        )
+        next_offset = pagination.page_offset + pagination.page_size
+        payload = {
+            "sessions": rows,
+            "total_count": total,
+            "next_page_token": next_offset if next_offset < total else None,
+        }
+        if _wants_msgpack(accept):
+            return MsgpackResponse(payload)
+        return MsgspecJSONResponse(payload)
     except Exception as e:
         logger.error(f"Error listing sessions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/sessions/{session_id}")
-async def get_session_details(session_id: str):
+def get_session_details(session: ConversationSession = Depends(get_session_or_404)):
     """Get detailed information about a specific session"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    session = chatbot.memory.sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     return {
         "id": session.id,
         "title": session.title,
-        "created_at": session.created_at.isoformat(),
-        "last_activity": session.last_activity.isoformat(),
+        "created_at": datetime.fromtimestamp(session.created_at).isoformat(),
+        "last_activity": datetime.fromtimestamp(
+            session.last_activity
+        ).isoformat(),
         "message_count": len(session.messages),
         "context": session.context,
         "is_current": session.id == chatbot.memory.current_session_id,
@@ -260,107 +351,80 @@ async def get_session_details(session_id: str):
 
 
 @app.post("/sessions/{session_id}/switch")
-async def switch_session(session_id: str):
+async def switch_session(session: ConversationSession = Depends(get_session_or_404)):
     """Switch to a specific session"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    if chatbot.memory.switch_session(session_id):
-        session = chatbot.memory.get_current_session()
-        return {
-            "message": f"✅ Switched to session: {session.title}",
-            "session_id": session_id,
-            "session_title": session.title,
-            "message_count": len(session.messages),
-        }
-    else:
-        raise HTTPException(status_code=404, detail="Session not found")
+    chatbot.memory.switch_session(session.id)
+    return {
+        "message": f"✅ Switched to session: {session.title}",
+        "session_id": session.id,
+        "session_title": session.title,
+        "message_count": len(session.messages),
+    }
 
 
 @app.delete("/sessions/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(session: ConversationSession = Depends(get_session_or_404)):
     """Delete a specific session"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    if chatbot.memory.delete_session(session_id):
-        return {"message": "✅ Session deleted successfully"}
-    else:
-        raise HTTPException(status_code=404, detail="Session not found")
+    chatbot.memory.delete_session(session.id)
+    return {"message": "✅ Session deleted successfully"}
 
 
 @app.post("/sessions/{session_id}/clear")
-async def clear_session(session_id: str):
+async def clear_session(session: ConversationSession = Depends(get_session_or_404)):
     """Clear all messages in a specific session"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    # Switch to session first
-    if not chatbot.memory.switch_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    chatbot.memory.clear_current_session()
+    chatbot.memory.clear_session(session.id)
     return {"message": "✅ Session messages cleared successfully"}
 
 
 @app.patch("/sessions/{session_id}/title")
-async def update_session_title(session_id: str, title: str):
+async def update_session_title(
+    title: str, session: ConversationSession = Depends(get_session_or_404)
+):
     """Update session title"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    # Switch to session first
-    if not chatbot.memory.switch_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    chatbot.memory.update_session_title(title)
+    chatbot.memory.update_session_title(title, session.id)
     return {"message": "✅ Session title updated successfully", "new_title": title}
 
 
 @app.get("/sessions/{session_id}/messages")
-async def get_session_messages(session_id: str, limit: Optional[int] = 50):
+def get_session_messages(
+    session: ConversationSession = Depends(get_session_or_404),
+    limit: Optional[int] = 50,
+    accept: Optional[str] = Header(None),
+):
     """Get messages from a specific session"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    session = chatbot.memory.sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    messages = session.messages
-    if limit:
-        messages = messages[-limit:]
-
-    return {
-        "session_id": session_id,
+    # Index math instead of a [-limit:] slice: no intermediate list copy
+    # when a 10k-message session is asked for its last 50.
+    all_messages = session.messages
+    total = len(all_messages)
+    start = max(0, total - limit) if limit else 0
+    msgs_iter = (all_messages[i] for i in range(start, total))
+
+    payload = {
+        "session_id": session.id,
         "session_title": session.title,
-        "total_messages": len(session.messages),
-        "returned_messages": len(messages),
+        "total_messages": total,
+        "returned_messages": total - start,
         "messages": [
             {
                 "id": msg.id,
                 "role": msg.role.value,
                 "content": msg.content,
-                "timestamp": msg.timestamp.isoformat(),
+                "timestamp": datetime.fromtimestamp(msg.timestamp).isoformat(),
                 "tool_calls": msg.tool_calls,
                 "tool_call_id": msg.tool_call_id,
             }
-            for msg in messages
+            for msg in msgs_iter
         ],
     }
+    if _wants_msgpack(accept):
+        return MsgpackResponse(payload)
+    return payload
 
 
 @app.get("/sessions/{session_id}/stats")
-async def get_session_stats(session_id: str):
+def get_session_stats(session: ConversationSession = Depends(get_session_or_404)):
     """Get statistics for a specific session"""
-    if not chatbot:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    # Switch to session to get stats
-    if not chatbot.memory.switch_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    stats = chatbot.memory.get_session_stats()
+    stats = chatbot.memory.get_session_stats(session.id)
     if "error" in stats:
         raise HTTPException(status_code=404, detail=stats["error"])
 
@@ -375,7 +439,11 @@ async def get_resource(request: ResourceRequest):
 
     try:
         result = await chatbot.get_resource(request.resource_uri)
-        return ResourceResponse(**result)
+        # Server-origin dict; skip the validating constructor.
+        # Server-origin dict already in response shape; returning a
+        # Response skips the response_model validation pass entirely
+        # (the model stays on the route purely for the OpenAPI docs).
+        return MsgspecJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -391,7 +459,11 @@ async def execute_prompt(request: PromptRequest):
 
     try:
         result = await chatbot.execute_prompt(request.prompt_name, request.args)
-        return PromptResponse(**result)
+        # Server-origin dict; skip the validating constructor.
+        # Server-origin dict already in response shape; returning a
+        # Response skips the response_model validation pass entirely
+        # (the model stays on the route purely for the OpenAPI docs).
+        return MsgspecJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -399,74 +471,81 @@ async def execute_prompt(request: PromptRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Catalog payloads change only when MCP servers (re)register, so each is
+# serialized once per chatbot.catalog_version and served as cached bytes;
+# staleness is one int comparison. The timestamp field these endpoints
+# used to carry reflected serialization time, not data change, so it is
+# dropped rather than defeating the cache.
+_catalog_cache: Dict[str, tuple] = {}
+
+
+def _cached_catalog(name: str, build) -> Response:
+    cached = _catalog_cache.get(name)
+    if cached is None or cached[0] != chatbot.catalog_version:
+        cached = (chatbot.catalog_version, _json_encoder.encode(build()))
+        _catalog_cache[name] = cached
+    return Response(cached[1], media_type="application/json")
+
+
 @app.get("/tools")
-async def get_available_tools():
+def get_available_tools():
     """Get list of available MCP tools"""
     if not chatbot:
         raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
-    tools = chatbot.get_available_tools()
-    return {
-        "tools": tools,
-        "count": len(tools),
-        "timestamp": datetime.now().isoformat(),
-    }
+    def build():
+        tools = chatbot.get_available_tools()
+        return {"tools": tools, "count": len(tools)}
+
+    return _cached_catalog("tools", build)
 
 
 @app.get("/prompts")
-async def get_available_prompts():
+def get_available_prompts():
     """Get list of available MCP prompts"""
     if not chatbot:
         raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
-    prompts = chatbot.get_available_prompts()
-    return {
-        "prompts": prompts,
-        "count": len(prompts),
-        "timestamp": datetime.now().isoformat(),
-    }
+    def build():
+        prompts = chatbot.get_available_prompts()
+        return {"prompts": prompts, "count": len(prompts)}
+
+    return _cached_catalog("prompts", build)
 
 
 @app.get("/resources")
-async def get_available_resources():
+def get_available_resources():
     """Get list of available MCP resources grouped by type"""
     if not chatbot:
         raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
-    resources = chatbot.get_available_resources()
-    total_count = sum(len(res_list) for res_list in resources.values())
+    def build():
+        resources = chatbot.get_available_resources()
+        return {
+            "resources": resources,
+            "counts": {
+                "gmail": len(resources["gmail"]),
+                "project": len(resources["project"]),
+                "company": len(resources["company"]),
+                "total": sum(len(res_list) for res_list in resources.values()),
+            },
+        }
 
-    return {
-        "resources": resources,
-        "counts": {
-            "gmail": len(resources["gmail"]),
-            "project": len(resources["project"]),
-            "company": len(resources["company"]),
-            "total": total_count,
-        },
-        "timestamp": datetime.now().isoformat(),
-    }
+    return _cached_catalog("resources", build)
 
 
 @app.get("/memory/stats", response_model=MemoryStatsResponse)
-async def get_memory_stats():
+def get_memory_stats():
     """Get comprehensive memory and system statistics"""
-    if not chatbot:
+    if not chatbot or not src_config.chatbot_service:
         raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
-    total_messages = sum(
-        len(session.messages) for session in chatbot.memory.sessions.values()
-    )
-    resources = chatbot.get_available_resources()
-    total_resources = sum(len(res_list) for res_list in resources.values())
-
-    return MemoryStatsResponse(
-        total_sessions=len(chatbot.memory.sessions),
-        current_session_id=chatbot.memory.current_session_id,
-        total_messages=total_messages,
-        active_tools=len(chatbot.available_tools),
-        active_prompts=len(chatbot.available_prompts),
-        active_resources=total_resources,
+    # Body pre-serialized by ChatBotService.stats_snapshot_loop every
+    # couple of seconds; the handler just hands the bytes over, which is
+    # what high-frequency monitoring pollers actually need.
+    return Response(
+        src_config.chatbot_service.stats_snapshot_bytes(),
+        media_type="application/json",
     )
 
 
@@ -477,10 +556,12 @@ async def save_memory():
         raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
     try:
-        chatbot.memory.save_memory()
+        # The index write hits the filesystem; run it in a worker thread so
+        # a slow disk doesn't stall the event loop for other clients.
+        await asyncio.to_thread(chatbot.memory.save_memory)
         return {
             "message": "💾 Memory saved successfully",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "sessions_saved": len(chatbot.memory.sessions),
         }
     except Exception as e:
@@ -489,19 +570,18 @@ async def save_memory():
 
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """Comprehensive health check endpoint"""
     if not chatbot:
         return {
             "status": "unhealthy",
             "chatbot_initialized": False,
             "message": "ChatBot not initialized",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
         }
 
     try:
         current_session = chatbot.memory.get_current_session()
-        resources = chatbot.get_available_resources()
 
         return {
             "status": "healthy",
@@ -516,44 +596,211 @@ async def health_check():
             "mcp": {
                 "available_tools": len(chatbot.available_tools),
                 "available_prompts": len(chatbot.available_prompts),
-                "available_resources": sum(
-                    len(res_list) for res_list in resources.values()
-                ),
+                "available_resources": chatbot.resource_count,
             },
             "uptime": "Available via /health endpoint",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
         }
     except Exception as e:
         return {
             "status": "degraded",
             "chatbot_initialized": True,
             "error": str(e),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
         }
 
 
 @app.options("/health")
 async def health_options():
     """Handle CORS preflight for health endpoint"""
-    return {"message": "OK"}
+    return Response(_OK_BYTES, media_type="application/json")
+
+
+# WebSocket message handlers, dispatched by frame "type" with one dict
+# lookup. Each handler gets the decoded frame, the per-frame timestamp and
+# the connection's encoder.
+
+# Error frames with constant text get fully pre-serialized bodies; only
+# the timestamp is spliced in per send. Dynamic error text (unknown
+# types, exception messages) still goes through the encoder.
+_ERROR_SUFFIX = b'"}'
+_ERROR_PREFIXES = {
+    msg: b'{"type":"error","error":"' + msg.encode() + b'","timestamp":"'
+    for msg in (
+        "ChatBot not initialized",
+        "Invalid message format",
+        "No query provided",
+        "Session not found",
+        "No resource_uri provided",
+    )
+}
+
+
+async def _ws_error(websocket, encode, message, now_iso):
+    prefix = None
+    if websocket.scope.get("codec") != "msgpack":
+        prefix = _ERROR_PREFIXES.get(message)
+    if prefix is not None:
+        await websocket.send_bytes(prefix + now_iso.encode() + _ERROR_SUFFIX)
+    else:
+        await websocket.send_bytes(
+            encode({"type": "error", "error": message, "timestamp": now_iso})
+        )
+
+
+async def _ws_chat(websocket, message_data, now_iso, encode):
+    # Same validation path as the REST endpoint: pydantic-core rejects
+    # empty/oversized queries before any chatbot work happens.
+    try:
+        request = ChatRequest.model_validate(message_data)
+    except ValidationError:
+        await _ws_error(websocket, encode, "No query provided", now_iso)
+        return
+    query, session_id = request.query, request.session_id
+
+    # Stream deltas as the model generates them so time-to-first-byte is
+    # one token, not the whole generation; the final envelope keeps the
+    # familiar chat_response shape.
+    result = None
+    try:
+        # Through the service wrapper so the WS path shares the LLM
+        # concurrency cap (and its queue timeout) with /chat.
+        async for kind, payload in src_config.chatbot_service.process_query_stream(
+            query, session_id
+        ):
+            if kind == "delta":
+                await websocket.send_bytes(
+                    encode({"type": "chat_delta", "text": payload})
+                )
+            else:
+                result = payload
+    except asyncio.TimeoutError:
+        await _ws_error(
+            websocket,
+            encode,
+            "Server is at capacity; please retry shortly",
+            now_iso,
+        )
+        return
+
+    await websocket.send_bytes(
+        encode(
+            {
+                "type": "chat_response",
+                "response": result["response"],
+                "session_id": result["session_id"],
+                "session_title": result["session_title"],
+                "tool_calls": result["tool_calls"],
+                "message_count": result["message_count"],
+                "timestamp": result["timestamp"],
+            }
+        )
+    )
+
+
+async def _ws_create_session(websocket, message_data, now_iso, encode):
+    title = message_data.get("title")
+    session_id = chatbot.memory.create_session(title)
+    session = chatbot.memory.get_current_session()
+
+    await websocket.send_bytes(
+        encode(
+            {
+                "type": "session_created",
+                "session_id": session_id,
+                "title": session.title,
+                "timestamp": now_iso,
+            }
+        )
+    )
+
+
+async def _ws_switch_session(websocket, message_data, now_iso, encode):
+    session_id = message_data.get("session_id")
+    if chatbot.memory.switch_session(session_id):
+        session = chatbot.memory.get_current_session()
+        await websocket.send_bytes(
+            encode(
+                {
+                    "type": "session_switched",
+                    "session_id": session_id,
+                    "title": session.title,
+                    "message_count": len(session.messages),
+                    "timestamp": now_iso,
+                }
+            )
+        )
+    else:
+        await _ws_error(websocket, encode, "Session not found", now_iso)
+
+
+async def _ws_list_sessions(websocket, message_data, now_iso, encode):
+    sessions = chatbot.memory.list_sessions()
+    await websocket.send_bytes(
+        encode(
+            {
+                "type": "sessions_list",
+                "sessions": sessions,
+                "timestamp": now_iso,
+            }
+        )
+    )
+
+
+async def _ws_get_resource(websocket, message_data, now_iso, encode):
+    resource_uri = message_data.get("resource_uri")
+    if resource_uri:
+        result = await chatbot.get_resource(resource_uri)
+        await websocket.send_bytes(
+            encode({"type": "resource_response", **result})
+        )
+    else:
+        await _ws_error(websocket, encode, "No resource_uri provided", now_iso)
+
+
+# Pongs are the most frequent frame on a long-lived connection; splice the
+# timestamp into a pre-serialized template instead of building and encoding
+# a dict per keepalive. msgpack connections still go through the encoder.
+_PONG_PREFIX = b'{"type":"pong","timestamp":"'
+_PONG_SUFFIX = b'"}'
+
+
+async def _ws_ping(websocket, message_data, now_iso, encode):
+    # Identity checks against _json_encoder.encode don't work (attribute
+    # access returns a fresh bound method each time); the connection's
+    # codec marker in scope is the reliable signal.
+    if websocket.scope.get("codec") == "msgpack":
+        await websocket.send_bytes(encode({"type": "pong", "timestamp": now_iso}))
+    else:
+        await websocket.send_bytes(_PONG_PREFIX + now_iso.encode() + _PONG_SUFFIX)
+
+
+_WS_HANDLERS = {
+    "chat": _ws_chat,
+    "create_session": _ws_create_session,
+    "switch_session": _ws_switch_session,
+    "list_sessions": _ws_list_sessions,
+    "get_resource": _ws_get_resource,
+    "ping": _ws_ping,
+}
 
 
 # WebSocket endpoint for real-time chat
 @app.websocket("/ws")
 async def websocket_chat(websocket: WebSocket):
     """WebSocket endpoint for real-time chat with full feature support"""
+    # ws://.../ws?format=msgpack switches the whole connection to binary
+    # msgpack frames; the default stays JSON.
+    use_msgpack = websocket.query_params.get("format") == "msgpack"
+    encode = _msgpack_encoder.encode if use_msgpack else _json_encoder.encode
+    if use_msgpack:
+        # Marker the frame helpers check before using the pre-serialized
+        # JSON templates (pong, constant errors).
+        websocket.scope["codec"] = "msgpack"
     await websocket.accept()
 
     if not chatbot:
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "error",
-                    "error": "ChatBot not initialized",
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
-        )
+        await _ws_error(websocket, encode, "ChatBot not initialized", _now_iso())
         await websocket.close()
         return
 
@@ -561,180 +808,56 @@ async def websocket_chat(websocket: WebSocket):
 
     try:
         # Send welcome message
-        await websocket.send_text(
-            json.dumps(
+        await websocket.send_bytes(
+            encode(
                 {
-                    "type": "welcome",
-                    "message": "🤖 Connected to Enhanced MCP ChatBot",
-                    "features": [
-                        "chat",
-                        "session_management",
-                        "tool_calls",
-                        "resources",
-                    ],
+                    **_WELCOME_STATIC,
                     "current_session": {
                         "id": chatbot.memory.current_session_id,
                         "title": chatbot.memory.get_current_session().title
                         if chatbot.memory.get_current_session()
                         else None,
                     },
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _now_iso(),
                 }
             )
         )
 
         while True:
             # Receive message from client
-            data = await websocket.receive_text()
-
             try:
-                message_data = json.loads(data)
-                message_type = message_data.get("type", "chat")
-
-                if message_type == "chat":
-                    query = message_data.get("query", "")
-                    session_id = message_data.get("session_id")
-
-                    if not query:
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "error",
-                                    "error": "No query provided",
-                                    "timestamp": datetime.now().isoformat(),
-                                }
-                            )
-                        )
-                        continue
-
-                    # Process the chat query
-                    result = await chatbot.process_query(query, session_id)
-
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "chat_response",
-                                "response": result["response"],
-                                "session_id": result["session_id"],
-                                "session_title": result["session_title"],
-                                "tool_calls": result["tool_calls"],
-                                "message_count": result["message_count"],
-                                "timestamp": result["timestamp"],
-                            }
-                        )
+                if use_msgpack:
+                    message_data = msgspec.msgpack.decode(
+                        await websocket.receive_bytes()
                     )
-
-                elif message_type == "create_session":
-                    title = message_data.get("title")
-                    session_id = chatbot.memory.create_session(title)
-                    session = chatbot.memory.get_current_session()
-
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "session_created",
-                                "session_id": session_id,
-                                "title": session.title,
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
+                else:
+                    message_data = msgspec.json.decode(
+                        await websocket.receive_text()
                     )
 
-                elif message_type == "switch_session":
-                    session_id = message_data.get("session_id")
-                    if chatbot.memory.switch_session(session_id):
-                        session = chatbot.memory.get_current_session()
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "session_switched",
-                                    "session_id": session_id,
-                                    "title": session.title,
-                                    "message_count": len(session.messages),
-                                    "timestamp": datetime.now().isoformat(),
-                                }
-                            )
-                        )
-                    else:
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "error",
-                                    "error": "Session not found",
-                                    "timestamp": datetime.now().isoformat(),
-                                }
-                            )
-                        )
-
-                elif message_type == "list_sessions":
-                    sessions = chatbot.memory.list_sessions()
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "sessions_list",
-                                "sessions": sessions,
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+                # One clock read per inbound frame; every handler stamps
+                # its reply with the same value.
+                now_iso = _now_iso()
+                message_type = message_data.get("type", "chat")
 
-                elif message_type == "get_resource":
-                    resource_uri = message_data.get("resource_uri")
-                    if resource_uri:
-                        result = await chatbot.get_resource(resource_uri)
-                        await websocket.send_text(
-                            json.dumps({"type": "resource_response", **result})
-                        )
-                    else:
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "error",
-                                    "error": "No resource_uri provided",
-                                    "timestamp": datetime.now().isoformat(),
-                                }
-                            )
-                        )
-
-                elif message_type == "ping":
-                    await websocket.send_text(
-                        json.dumps(
-                            {"type": "pong", "timestamp": datetime.now().isoformat()}
-                        )
+                handler = _WS_HANDLERS.get(message_type)
+                if handler is None:
+                    await _ws_error(
+                        websocket,
+                        encode,
+                        f"Unknown message type: {message_type}",
+                        now_iso,
                     )
-
                 else:
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "error",
-                                "error": f"Unknown message type: {message_type}",
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+                    await handler(websocket, message_data, now_iso, encode)
 
-            except json.JSONDecodeError:
-                await websocket.send_text(
-                    json.dumps(
-                        {
-                            "type": "error",
-                            "error": "Invalid JSON format",
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    )
+            except msgspec.DecodeError:
+                await _ws_error(
+                    websocket, encode, "Invalid message format", _now_iso()
                 )
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
-                await websocket.send_text(
-                    json.dumps(
-                        {
-                            "type": "error",
-                            "error": str(e),
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    )
-                )
+                await _ws_error(websocket, encode, str(e), _now_iso())
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
@@ -743,4 +866,33 @@ async def websocket_chat(websocket: WebSocket):
 
 
 if __name__ == "__main__":
-    uvicorn.run("server:app", port=8000, reload=True, log_level="info")
+    if os.getenv("ENV") == "prod":
+        # One worker by default: every worker builds its own MemoryManager
+        # over the same sessions/ directory, and concurrent index rewrites
+        # and cleanup unlinks corrupt the shared store. Raise
+        # WEB_CONCURRENCY only once session storage is shared (or each
+        # worker gets its own storage dir).
+        uvicorn.run(
+            "server:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools",
+            ws="websockets",
+            ws_per_message_deflate=True,
+            timeout_keep_alive=75,
+            log_level="warning",
+        )
+    else:
+        uvicorn.run(
+            "server:app",
+            port=8000,
+            reload=False,
+            loop="uvloop",
+            http="httptools",
+            ws="websockets",
+            ws_per_message_deflate=True,
+            timeout_keep_alive=75,
+            log_level="info",
+        )
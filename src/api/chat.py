@@ -2,33 +2,51 @@
 Chat-related API endpoints
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Optional
 
-from ..core.config import get_chatbot_service
-from ..models.schemas import ChatRequest, ChatResponse
+from fastapi import APIRouter, Depends, Header, HTTPException
 
-router = APIRouter(tags=["Chat"])
+from fastapi.responses import Response
+
+from ..core.config import (
+    OK_BYTES,
+    MsgpackResponse,
+    MsgspecJSONResponse,
+    require_chatbot,
+    wants_msgpack,
+)
+from ..models.schemas import ChatRequest, ChatResponse  # noqa: F401 (docs schema)
+
+# Explicit here as well as on the app: this router is also mounted via
+# the legacy router, which shouldn't fall back to stdlib json.dumps.
+router = APIRouter(tags=["Chat"], default_response_class=MsgspecJSONResponse)
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    accept: Optional[str] = Header(None),
+    chatbot_service=Depends(require_chatbot),
+):
     """Send a chat message and get response with memory persistence"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
     try:
-        result = await chatbot_service.process_query(request.query, request.session_id)
-
-        return ChatResponse(
-            response=result["response"],
-            session_id=result["session_id"],
-            session_title=result["session_title"],
-            tool_calls=result["tool_calls"],
-            timestamp=result["timestamp"],
-            message_count=result["message_count"],
+        result = await chatbot_service.process_query(
+            request.query, request.session_id, no_cache=request.no_cache
         )
 
+        if wants_msgpack(accept):
+            return MsgpackResponse(result)
+
+        # process_query already returns the response-shaped dict; skip the
+        # ChatResponse validation pass and jsonable_encoder entirely.
+        return MsgspecJSONResponse(result)
+
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is at capacity; please retry shortly",
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -38,4 +56,4 @@ async def chat(request: ChatRequest):
 @router.options("/chat")
 async def chat_options():
     """Handle CORS preflight for chat endpoint"""
-    return {"message": "OK"}
+    return Response(OK_BYTES, media_type="application/json")
@@ -2,11 +2,10 @@
 MCP (Model Context Protocol) related API endpoints
 """
 
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 
-from fastapi import APIRouter, HTTPException
-
-from ..core.config import get_chatbot_service
+from ..core.config import MsgspecJSONResponse, require_chatbot
 from ..models.schemas import (
     PromptRequest,
     PromptResponse,
@@ -18,15 +17,16 @@ router = APIRouter(tags=["MCP"])
 
 
 @router.post("/resource", response_model=ResourceResponse)
-async def get_resource(request: ResourceRequest):
+async def get_resource(
+    request: ResourceRequest, chatbot_service=Depends(require_chatbot)
+):
     """Get content from a specific MCP resource"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
     try:
         result = await chatbot_service.get_resource(request.resource_uri)
-        return ResourceResponse(**result)
+        # Server-origin dict already in response shape; returning a
+        # Response skips the response_model validation pass entirely
+        # (the model stays on the route purely for the OpenAPI docs).
+        return MsgspecJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -34,15 +34,16 @@ async def get_resource(request: ResourceRequest):
 
 
 @router.post("/prompt", response_model=PromptResponse)
-async def execute_prompt(request: PromptRequest):
+async def execute_prompt(
+    request: PromptRequest, chatbot_service=Depends(require_chatbot)
+):
     """Execute an MCP prompt with given arguments"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
     try:
         result = await chatbot_service.execute_prompt(request.prompt_name, request.args)
-        return PromptResponse(**result)
+        # Server-origin dict already in response shape; returning a
+        # Response skips the response_model validation pass entirely
+        # (the model stays on the route purely for the OpenAPI docs).
+        return MsgspecJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -50,52 +51,27 @@ async def execute_prompt(request: PromptRequest):
 
 
 @router.get("/tools")
-async def get_available_tools():
+def get_available_tools(chatbot_service=Depends(require_chatbot)):
     """Get list of available MCP tools"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    tools = chatbot_service.get_available_tools()
-    return {
-        "tools": tools,
-        "count": len(tools),
-        "timestamp": datetime.now().isoformat(),
-    }
+    return Response(
+        chatbot_service.tools_catalog_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.get("/prompts")
-async def get_available_prompts():
+def get_available_prompts(chatbot_service=Depends(require_chatbot)):
     """Get list of available MCP prompts"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    prompts = chatbot_service.get_available_prompts()
-    return {
-        "prompts": prompts,
-        "count": len(prompts),
-        "timestamp": datetime.now().isoformat(),
-    }
+    return Response(
+        chatbot_service.prompts_catalog_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.get("/resources")
-async def get_available_resources():
+def get_available_resources(chatbot_service=Depends(require_chatbot)):
     """Get list of available MCP resources grouped by type"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    resources = chatbot_service.get_available_resources()
-    total_count = sum(len(res_list) for res_list in resources.values())
-
-    return {
-        "resources": resources,
-        "counts": {
-            "gmail": len(resources["gmail"]),
-            "project": len(resources["project"]),
-            "company": len(resources["company"]),
-            "total": total_count,
-        },
-        "timestamp": datetime.now().isoformat(),
-    }
+    return Response(
+        chatbot_service.resources_catalog_bytes(),
+        media_type="application/json",
+    )
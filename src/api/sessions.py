@@ -2,23 +2,37 @@
 Session management API endpoints
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from ..core.config import get_chatbot_service
-from ..models.schemas import SessionCreateRequest, SessionResponse
+from fastapi.responses import Response
+
+from ..core.config import OK_BYTES, MsgspecJSONResponse, require_chatbot
+from ..models.schemas import SessionCreateRequest, SessionPagination
 
 router = APIRouter(tags=["Sessions"])
 
 
+def get_session_or_404(session_id: str):
+    """Resolve the {session_id} path parameter to a session, once.
+
+    Shared dependency for every /{session_id}/... endpoint so the init
+    check and 404 branch live in exactly one place.
+    """
+    chatbot_service = require_chatbot()
+    session = chatbot_service.chatbot.memory.sessions.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
 @router.post("/sessions")
-async def create_session(request: SessionCreateRequest):
+async def create_session(
+    request: SessionCreateRequest, chatbot_service=Depends(require_chatbot)
+):
     """Create a new chat session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
     try:
         session_id = chatbot_service.chatbot.memory.create_session(request.title)
         session = chatbot_service.chatbot.memory.get_current_session()
@@ -26,7 +40,7 @@ async def create_session(request: SessionCreateRequest):
         return {
             "session_id": session_id,
             "title": session.title,
-            "created_at": session.created_at.isoformat(),
+            "created_at": datetime.fromtimestamp(session.created_at).isoformat(),
             "message": "✅ Session created successfully",
         }
     except Exception as e:
@@ -36,49 +50,47 @@ async def create_session(request: SessionCreateRequest):
 @router.options("/sessions")
 async def sessions_options():
     """Handle CORS preflight for sessions endpoint"""
-    return {"message": "OK"}
-
+    return Response(OK_BYTES, media_type="application/json")
 
-@router.get("/sessions", response_model=List[SessionResponse])
-async def list_sessions():
-    """List all chat sessions with metadata"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
 
+@router.get("/sessions")
+def list_sessions(
+    pagination: SessionPagination = Depends(),
+    chatbot_service=Depends(require_chatbot),
+):
+    """List chat sessions with metadata, one bounded page at a time"""
     try:
-        sessions_data = chatbot_service.chatbot.memory.list_sessions()
-        return [
-            SessionResponse(
-                id=session["id"],
-                title=session["title"],
-                created_at=session["created_at"],
-                last_activity=session["last_activity"],
-                message_count=session["message_count"],
-                is_current=session["is_current"],
-            )
-            for session in sessions_data
-        ]
+        memory = chatbot_service.chatbot.memory
+        total = len(memory.sessions)
+        # memory.list_sessions() already returns response-shaped dicts;
+        # serialize them directly instead of re-validating every row.
+        rows = memory.list_sessions(
+            limit=pagination.page_size, offset=pagination.page_offset
+        )
+        next_offset = pagination.page_offset + pagination.page_size
+        return MsgspecJSONResponse(
+            {
+                "sessions": rows,
+                "total_count": total,
+                "next_page_token": next_offset if next_offset < total else None,
+            }
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{session_id}")
-async def get_session_details(session_id: str):
+def get_session_details(
+    session=Depends(get_session_or_404), chatbot_service=Depends(require_chatbot)
+):
     """Get detailed information about a specific session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    session = chatbot_service.chatbot.memory.sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     return {
         "id": session.id,
         "title": session.title,
-        "created_at": session.created_at.isoformat(),
-        "last_activity": session.last_activity.isoformat(),
+        "created_at": datetime.fromtimestamp(session.created_at).isoformat(),
+        "last_activity": datetime.fromtimestamp(
+            session.last_activity
+        ).isoformat(),
         "message_count": len(session.messages),
         "context": session.context,
         "is_current": session.id == chatbot_service.chatbot.memory.current_session_id,
@@ -86,113 +98,85 @@ async def get_session_details(session_id: str):
 
 
 @router.post("/{session_id}/switch")
-async def switch_session(session_id: str):
+async def switch_session(
+    session=Depends(get_session_or_404), chatbot_service=Depends(require_chatbot)
+):
     """Switch to a specific session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    if chatbot_service.chatbot.memory.switch_session(session_id):
-        session = chatbot_service.chatbot.memory.get_current_session()
-        return {
-            "message": f"✅ Switched to session: {session.title}",
-            "session_id": session_id,
-            "session_title": session.title,
-            "message_count": len(session.messages),
-        }
-    else:
-        raise HTTPException(status_code=404, detail="Session not found")
+    chatbot_service.chatbot.memory.switch_session(session.id)
+    return {
+        "message": f"✅ Switched to session: {session.title}",
+        "session_id": session.id,
+        "session_title": session.title,
+        "message_count": len(session.messages),
+    }
 
 
 @router.delete("/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(
+    session=Depends(get_session_or_404), chatbot_service=Depends(require_chatbot)
+):
     """Delete a specific session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    if chatbot_service.chatbot.memory.delete_session(session_id):
-        return {"message": "✅ Session deleted successfully"}
-    else:
-        raise HTTPException(status_code=404, detail="Session not found")
+    chatbot_service.chatbot.memory.delete_session(session.id)
+    return {"message": "✅ Session deleted successfully"}
 
 
 @router.post("/{session_id}/clear")
-async def clear_session(session_id: str):
+async def clear_session(
+    session=Depends(get_session_or_404), chatbot_service=Depends(require_chatbot)
+):
     """Clear all messages in a specific session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    # Switch to session first
-    if not chatbot_service.chatbot.memory.switch_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    chatbot_service.chatbot.memory.clear_current_session()
+    chatbot_service.chatbot.memory.clear_session(session.id)
     return {"message": "✅ Session messages cleared successfully"}
 
 
 @router.patch("/{session_id}/title")
-async def update_session_title(session_id: str, title: str):
+async def update_session_title(
+    title: str,
+    session=Depends(get_session_or_404),
+    chatbot_service=Depends(require_chatbot),
+):
     """Update session title"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    # Switch to session first
-    if not chatbot_service.chatbot.memory.switch_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    chatbot_service.chatbot.memory.update_session_title(title)
+    chatbot_service.chatbot.memory.update_session_title(title, session.id)
     return {"message": "✅ Session title updated successfully", "new_title": title}
 
 
 @router.get("/{session_id}/messages")
-async def get_session_messages(session_id: str, limit: Optional[int] = 50):
+def get_session_messages(
+    session=Depends(get_session_or_404), limit: Optional[int] = 50
+):
     """Get messages from a specific session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    session = chatbot_service.chatbot.memory.sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    messages = session.messages
-    if limit:
-        messages = messages[-limit:]
+    # Index math instead of a [-limit:] slice: no intermediate list copy
+    # when a 10k-message session is asked for its last 50.
+    all_messages = session.messages
+    total = len(all_messages)
+    start = max(0, total - limit) if limit else 0
+    msgs_iter = (all_messages[i] for i in range(start, total))
 
     return {
-        "session_id": session_id,
+        "session_id": session.id,
         "session_title": session.title,
-        "total_messages": len(session.messages),
-        "returned_messages": len(messages),
+        "total_messages": total,
+        "returned_messages": total - start,
         "messages": [
             {
                 "id": msg.id,
                 "role": msg.role.value,
                 "content": msg.content,
-                "timestamp": msg.timestamp.isoformat(),
+                "timestamp": datetime.fromtimestamp(msg.timestamp).isoformat(),
                 "tool_calls": msg.tool_calls,
                 "tool_call_id": msg.tool_call_id,
             }
-            for msg in messages
+            for msg in msgs_iter
         ],
     }
 
 
 @router.get("/{session_id}/stats")
-async def get_session_stats(session_id: str):
+def get_session_stats(
+    session=Depends(get_session_or_404), chatbot_service=Depends(require_chatbot)
+):
     """Get statistics for a specific session"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    # Switch to session to get stats
-    if not chatbot_service.chatbot.memory.switch_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    stats = chatbot_service.chatbot.memory.get_session_stats()
+    stats = chatbot_service.chatbot.memory.get_session_stats(session.id)
     if "error" in stats:
         raise HTTPException(status_code=404, detail=stats["error"])
 
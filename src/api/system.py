@@ -2,52 +2,40 @@
 Memory management and health check API endpoints
 """
 
-from datetime import datetime
+import asyncio
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 
-from ..core.config import get_chatbot_service
-from ..models.schemas import MemoryStatsResponse
+from ..core.clock import now_iso
+from ..core.config import OK_BYTES, get_chatbot_service, require_chatbot
+from ..models.schemas import MemoryStatsResponse  # noqa: F401 (docs schema)
 
 router = APIRouter(tags=["System"])
 
 
 @router.get("/memory/stats", response_model=MemoryStatsResponse)
-async def get_memory_stats():
+def get_memory_stats(chatbot_service=Depends(require_chatbot)):
     """Get comprehensive memory and system statistics"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
-    total_messages = sum(
-        len(session.messages)
-        for session in chatbot_service.chatbot.memory.sessions.values()
-    )
-    resources = chatbot_service.get_available_resources()
-    total_resources = sum(len(res_list) for res_list in resources.values())
-
-    return MemoryStatsResponse(
-        total_sessions=len(chatbot_service.chatbot.memory.sessions),
-        current_session_id=chatbot_service.chatbot.memory.current_session_id,
-        total_messages=total_messages,
-        active_tools=len(chatbot_service.chatbot.available_tools),
-        active_prompts=len(chatbot_service.chatbot.available_prompts),
-        active_resources=total_resources,
+    # Body pre-serialized by ChatBotService.stats_snapshot_loop every
+    # couple of seconds; the handler just hands the bytes over, which is
+    # what high-frequency monitoring pollers actually need.
+    return Response(
+        chatbot_service.stats_snapshot_bytes(),
+        media_type="application/json",
     )
 
 
 @router.post("/memory/save")
-async def save_memory():
+async def save_memory(chatbot_service=Depends(require_chatbot)):
     """Manually trigger memory save to disk"""
-    chatbot_service = get_chatbot_service()
-    if not chatbot_service or not chatbot_service.is_initialized:
-        raise HTTPException(status_code=503, detail="ChatBot not initialized")
-
     try:
-        chatbot_service.chatbot.memory.save_memory()
+        # The index write hits the filesystem; run it in a worker thread so
+        # a slow disk doesn't stall the event loop for other clients.
+        await asyncio.to_thread(chatbot_service.chatbot.memory.save_memory)
         return {
             "message": "💾 Memory saved successfully",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "sessions_saved": len(chatbot_service.chatbot.memory.sessions),
         }
     except Exception as e:
@@ -55,7 +43,7 @@ async def save_memory():
 
 
 @router.get("/health")
-async def health_check():
+def health_check():
     """Comprehensive health check endpoint"""
     chatbot_service = get_chatbot_service()
 
@@ -64,12 +52,11 @@ async def health_check():
             "status": "unhealthy",
             "chatbot_initialized": False,
             "message": "ChatBot not initialized",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
         }
 
     try:
         current_session = chatbot_service.chatbot.memory.get_current_session()
-        resources = chatbot_service.get_available_resources()
 
         return {
             "status": "healthy",
@@ -84,23 +71,21 @@ async def health_check():
             "mcp": {
                 "available_tools": len(chatbot_service.chatbot.available_tools),
                 "available_prompts": len(chatbot_service.chatbot.available_prompts),
-                "available_resources": sum(
-                    len(res_list) for res_list in resources.values()
-                ),
+                "available_resources": chatbot_service.chatbot.resource_count,
             },
             "uptime": "Available via /health endpoint",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
         }
     except Exception as e:
         return {
             "status": "degraded",
             "chatbot_initialized": True,
             "error": str(e),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
         }
 
 
 @router.options("/health")
 async def health_options():
     """Handle CORS preflight for health endpoint"""
-    return {"message": "OK"}
+    return Response(OK_BYTES, media_type="application/json")
@@ -0,0 +1,25 @@
+"""
+Cached wall-clock timestamp formatter for hot paths
+"""
+
+import time
+from datetime import datetime
+
+# Handlers stamp nearly every payload with datetime.now().isoformat();
+# each call allocates a datetime and formats a fresh string. None of the
+# stamped payloads need sub-10ms accuracy, so reformat lazily at most
+# once per 10ms tick and hand out the cached string in between.
+_TICK = 0.01
+
+_last_tick = 0.0
+_cached = ""
+
+
+def now_iso() -> str:
+    """ISO-8601 timestamp string, accurate to ~10ms"""
+    global _last_tick, _cached
+    tick = time.monotonic()
+    if not _cached or tick - _last_tick >= _TICK:
+        _cached = datetime.now().isoformat()
+        _last_tick = tick
+    return _cached
@@ -2,12 +2,18 @@
 Core application configuration and settings
 """
 
+import asyncio
 import logging
+import os
+import time
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Optional
 
-from fastapi import FastAPI
+import msgspec
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 
 from ..services.chatbot_service import ChatBotService
 
@@ -18,17 +24,89 @@ logger = logging.getLogger(__name__)
 # Global chatbot service instance
 chatbot_service: Optional[ChatBotService] = None
 
+_json_encoder = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSONResponse rendered by msgspec's C encoder.
+
+    Response bodies here are plain dicts/lists (tool results can be large),
+    so swapping the stdlib serializer for msgspec cuts per-response CPU
+    without changing the wire format.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _json_encoder.encode(content)
+
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+class MsgpackResponse(Response):
+    """Binary msgpack rendering for clients that ask for it.
+
+    30-50% smaller than JSON for tool_calls/messages arrays and cheaper
+    for the client to parse; selected via Accept: application/x-msgpack.
+    """
+
+    media_type = "application/x-msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return _msgpack_encoder.encode(content)
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    return bool(accept) and "application/x-msgpack" in accept
+
+
+# Serialized once at import; OPTIONS preflight handlers return these
+# bytes directly instead of re-encoding the same dict per request.
+OK_BYTES = b'{"message":"OK"}'
+
+
+# Empty sessions older than the idle TTL are deleted by a background
+# loop so memory stays bounded under clients that create-and-abandon.
+SESSION_IDLE_TTL = float(os.getenv("MCP_SESSION_IDLE_TTL", 24 * 3600))
+_CLEANUP_INTERVAL = 900.0
+
+
+async def session_cleanup_loop(service: ChatBotService) -> None:
+    """Periodically drop idle, empty sessions to bound resident memory"""
+    while True:
+        await asyncio.sleep(_CLEANUP_INTERVAL)
+        memory = service.chatbot.memory
+        now = time.time()
+        stale = [
+            session_id
+            for session_id, session in memory.sessions.items()
+            if not session.messages
+            and session_id != memory.current_session_id
+            and now - session.last_activity > SESSION_IDLE_TTL
+        ]
+        for session_id in stale:
+            memory.delete_session(session_id)
+        if stale:
+            logger.info(f"Session cleanup removed {len(stale)} idle sessions")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events using lifespan context manager"""
     global chatbot_service
 
+    background_tasks = []
+
     # Startup
     try:
         logger.info("🚀 Initializing Enhanced MCP ChatBot...")
         chatbot_service = ChatBotService()
         await chatbot_service.initialize()
+        background_tasks.append(
+            asyncio.create_task(session_cleanup_loop(chatbot_service))
+        )
+        background_tasks.append(
+            asyncio.create_task(chatbot_service.stats_snapshot_loop())
+        )
         logger.info("✅ Enhanced MCP ChatBot initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize chatbot: {e}")
@@ -37,6 +115,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
     if chatbot_service:
         await chatbot_service.cleanup()
     logger.info("👋 FastAPI app shutdown and resources cleaned up")
@@ -51,6 +131,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=MsgspecJSONResponse,
     )
 
     # Add CORS middleware
@@ -62,9 +143,26 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Session histories can run to megabytes of JSON; gzip them on the
+    # way out. Level 5 keeps the CPU cost small, and the 1 KiB floor
+    # leaves the tiny static payloads untouched.
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
     return app
 
 
 def get_chatbot_service() -> Optional[ChatBotService]:
     """Get the global chatbot service instance"""
     return chatbot_service
+
+
+def require_chatbot() -> ChatBotService:
+    """Dependency form of get_chatbot_service that 503s when unavailable.
+
+    Endpoints that need a working chatbot declare
+    Depends(require_chatbot) instead of repeating the None/initialized
+    checks inline.
+    """
+    if not chatbot_service or not chatbot_service.is_initialized:
+        raise HTTPException(status_code=503, detail="ChatBot not initialized")
+    return chatbot_service
@@ -4,12 +4,22 @@ Pydantic models for API requests and responses
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class SessionPagination(BaseModel):
+    """Query parameters bounding a /sessions listing to one page"""
+
+    page_size: int = Field(50, ge=1, le=500)
+    page_offset: int = Field(0, ge=0)
 
 
 class ChatRequest(BaseModel):
-    query: str
+    # Reject empty/oversized queries at the router boundary instead of
+    # discovering them after an LLM round-trip.
+    query: str = Field(min_length=1, max_length=32_000)
     session_id: Optional[str] = None
+    no_cache: bool = False
 
 
 class ChatResponse(BaseModel):
@@ -2,16 +2,37 @@
 ChatBot service wrapper for the Enhanced MCP ChatBot
 """
 
+import asyncio
+import logging
 import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-# Import from the root level (relative to project root)
-import sys
-from typing import Any, Dict, List, Optional
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import msgspec
 
 from enhanced_mcp_client import EnhancedMCPChatBot
 
+logger = logging.getLogger(__name__)
+
+_json_encoder = msgspec.json.Encoder()
+
+# Repeated identical queries (client retries, double-submits, dashboard
+# refreshes) get the stored answer for an hour instead of a fresh LLM
+# round-trip. Entries are namespaced per session so answers never leak
+# across conversations.
+_RESPONSE_CACHE_TTL = 3600.0
+_RESPONSE_CACHE_MAX = 1024
+
+# Monitoring polls /memory/stats at high frequency; a snapshot refreshed
+# every couple of seconds is plenty fresh for dashboards.
+_STATS_SNAPSHOT_INTERVAL = 2.0
+
+# Cap on chat turns in flight against the LLM at once; beyond it,
+# requests queue for up to the timeout and then fail fast instead of
+# piling unbounded work onto the provider (and our memory).
+_MAX_CONCURRENT_LLM = int(os.getenv("MCP_MAX_CONCURRENT_LLM", "8"))
+_LLM_QUEUE_TIMEOUT = 30.0
+
 
 class ChatBotService:
     """Service wrapper for EnhancedMCPChatBot with additional functionality"""
@@ -19,12 +40,107 @@ class ChatBotService:
     def __init__(self):
         self._chatbot: Optional[EnhancedMCPChatBot] = None
         self._initialized = False
+        # Serialized catalog bodies keyed by the chatbot's catalog_version;
+        # tool/prompt/resource lists only change when MCP servers
+        # (re)register, so staleness is one int comparison.
+        self._catalog_cache: Dict[str, Tuple[int, bytes]] = {}
+        # (session_id, turn position, normalized query) -> (expiry, payload)
+        self._response_cache: Dict[
+            Tuple[str, int, str], Tuple[float, Dict[str, Any]]
+        ] = {}
+        # Pre-serialized /memory/stats body, refreshed by stats_snapshot_loop
+        self._stats_snapshot_bytes: Optional[bytes] = None
+        self._llm_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_LLM)
+
+    def catalog_bytes(self, name: str, build: Callable[[], Any]) -> bytes:
+        """Serialized catalog payload, rebuilt only when the catalog changes"""
+        version = self.chatbot.catalog_version
+        cached = self._catalog_cache.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+        body = _json_encoder.encode(build())
+        self._catalog_cache[name] = (version, body)
+        return body
+
+    def tools_catalog_bytes(self) -> bytes:
+        def build():
+            tools = self.get_available_tools()
+            return {"tools": tools, "count": len(tools)}
+
+        return self.catalog_bytes("tools", build)
+
+    def prompts_catalog_bytes(self) -> bytes:
+        def build():
+            prompts = self.get_available_prompts()
+            return {"prompts": prompts, "count": len(prompts)}
+
+        return self.catalog_bytes("prompts", build)
+
+    def resources_catalog_bytes(self) -> bytes:
+        def build():
+            resources = self.get_available_resources()
+            return {
+                "resources": resources,
+                "counts": {
+                    "gmail": len(resources["gmail"]),
+                    "project": len(resources["project"]),
+                    "company": len(resources["company"]),
+                    "total": sum(len(res_list) for res_list in resources.values()),
+                },
+            }
+
+        return self.catalog_bytes("resources", build)
+
+    def warm_caches(self) -> None:
+        """Pre-serialize the catalog bodies so the first request is warm"""
+        start = time.perf_counter()
+        self.tools_catalog_bytes()
+        self.prompts_catalog_bytes()
+        self.resources_catalog_bytes()
+        logger.info(
+            f"Catalog warmup took {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    def _build_stats(self) -> Dict[str, Any]:
+        memory = self.chatbot.memory
+        return {
+            "total_sessions": len(memory.sessions),
+            "current_session_id": memory.current_session_id,
+            "total_messages": memory.total_messages,
+            "active_tools": len(self.chatbot.available_tools),
+            "active_prompts": len(self.chatbot.available_prompts),
+            "active_resources": self.chatbot.resource_count,
+        }
+
+    def stats_snapshot_bytes(self) -> bytes:
+        """Latest serialized stats body, computed on demand before the
+        first loop tick"""
+        if self._stats_snapshot_bytes is None:
+            self._stats_snapshot_bytes = _json_encoder.encode(self._build_stats())
+        return self._stats_snapshot_bytes
+
+    async def stats_snapshot_loop(self) -> None:
+        """Keep the serialized stats body warm so the endpoint only
+        hands bytes to the response"""
+        while True:
+            self._stats_snapshot_bytes = _json_encoder.encode(self._build_stats())
+            await asyncio.sleep(_STATS_SNAPSHOT_INTERVAL)
 
     async def initialize(self) -> None:
         """Initialize the MCP ChatBot"""
         self._chatbot = EnhancedMCPChatBot()
         await self._chatbot.initialize()
         self._initialized = True
+        self.warm_caches()
+
+    @classmethod
+    def from_chatbot(cls, chatbot: EnhancedMCPChatBot) -> "ChatBotService":
+        """Wrap an already-initialized chatbot (legacy server.py owns it)"""
+        service = cls()
+        service._chatbot = chatbot
+        service._initialized = True
+        service.warm_caches()
+        return service
 
     async def cleanup(self) -> None:
         """Cleanup the MCP ChatBot resources"""
@@ -44,11 +160,72 @@ class ChatBotService:
             raise RuntimeError("ChatBot not initialized")
         return self._chatbot
 
+    def _cache_key(
+        self, query: str, session_id: Optional[str]
+    ) -> Tuple[str, int, str]:
+        namespace = session_id or self.chatbot.memory.current_session_id or ""
+        # The turn position pins the entry to this exact point in the
+        # conversation: "yes"/"continue"/"why?" legitimately recur later
+        # in a session with different meaning and must miss then. Only
+        # true retries and double-submits — same text, same history —
+        # can replay the stored answer.
+        session = self.chatbot.memory.sessions.get(namespace)
+        position = len(session.messages) if session else 0
+        return (namespace, position, " ".join(query.split()).lower())
+
     async def process_query(
-        self, query: str, session_id: Optional[str] = None
+        self, query: str, session_id: Optional[str] = None, no_cache: bool = False
     ) -> Dict[str, Any]:
-        """Process a chat query"""
-        return await self.chatbot.process_query(query, session_id)
+        """Process a chat query, serving repeats from the response cache"""
+        key = self._cache_key(query, session_id)
+        if not no_cache:
+            hit = self._response_cache.get(key)
+            if hit and time.monotonic() < hit[0]:
+                return hit[1]
+
+        # Saturation surfaces as asyncio.TimeoutError; the HTTP layer
+        # turns that into a 503 so clients know to back off and retry.
+        await asyncio.wait_for(
+            self._llm_semaphore.acquire(), timeout=_LLM_QUEUE_TIMEOUT
+        )
+        try:
+            result = await self.chatbot.process_query(query, session_id)
+        finally:
+            self._llm_semaphore.release()
+
+        # Tool-calling turns have side effects and fresher answers than
+        # any cache; only pure-text responses are worth replaying.
+        if not no_cache and not result.get("tool_calls"):
+            if len(self._response_cache) >= _RESPONSE_CACHE_MAX:
+                now = time.monotonic()
+                expired = [k for k, v in self._response_cache.items() if v[0] <= now]
+                for k in expired:
+                    del self._response_cache[k]
+                if len(self._response_cache) >= _RESPONSE_CACHE_MAX:
+                    self._response_cache.clear()
+            self._response_cache[key] = (
+                time.monotonic() + _RESPONSE_CACHE_TTL,
+                result,
+            )
+        return result
+
+    async def process_query_stream(
+        self, query: str, session_id: Optional[str] = None
+    ):
+        """Stream a chat query's ("delta", text) chunks and ("end", payload)
+
+        Holds the LLM semaphore for the duration of the stream so
+        WebSocket chat obeys the same concurrency cap as /chat; callers
+        see asyncio.TimeoutError when the queue is saturated.
+        """
+        await asyncio.wait_for(
+            self._llm_semaphore.acquire(), timeout=_LLM_QUEUE_TIMEOUT
+        )
+        try:
+            async for item in self.chatbot.process_query_stream(query, session_id):
+                yield item
+        finally:
+            self._llm_semaphore.release()
 
     async def get_resource(self, resource_uri: str) -> Dict[str, Any]:
         """Get content from a specific MCP resource"""
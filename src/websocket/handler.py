@@ -2,35 +2,112 @@
 WebSocket handler for real-time chat
 """
 
-import json
+import asyncio
 import logging
-from datetime import datetime
 
+import msgspec
 from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
 
+from ..core.clock import now_iso
 from ..core.config import get_chatbot_service
+from ..models.schemas import ChatRequest
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; reused for every outbound frame
+_json_encoder = msgspec.json.Encoder()
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+# Pongs are the most frequent frame on a long-lived connection; splice the
+# timestamp into a pre-serialized template instead of building and encoding
+# a dict per keepalive. msgpack connections still go through the encoder.
+_PONG_PREFIX = b'{"type":"pong","timestamp":"'
+_PONG_SUFFIX = b'"}'
+
+# Error frames with constant text get fully pre-serialized bodies; only
+# the timestamp is spliced in per send. Dynamic error text (unknown
+# types, exception messages) still goes through the encoder.
+_ERROR_SUFFIX = b'"}'
+_ERROR_PREFIXES = {
+    msg: b'{"type":"error","error":"' + msg.encode() + b'","timestamp":"'
+    for msg in (
+        "ChatBot not initialized",
+        "Invalid message format",
+        "No query provided",
+        "Session not found",
+        "No resource_uri provided",
+    )
+}
+
+# Everything in the welcome frame except the session info and timestamp
+# is constant; build that part once.
+_WELCOME_STATIC = {
+    "type": "welcome",
+    "message": "🤖 Connected to Enhanced MCP ChatBot",
+    "features": [
+        "chat",
+        "session_management",
+        "tool_calls",
+        "resources",
+    ],
+}
+
 
 class WebSocketManager:
     """WebSocket connection manager for real-time chat"""
 
+    def __init__(self):
+        # Table-driven dispatch: one dict lookup per frame instead of an
+        # if/elif ladder. Every handler shares the same signature.
+        self._handlers = {
+            "chat": self._handle_chat_message,
+            "create_session": self._handle_create_session,
+            "switch_session": self._handle_switch_session,
+            "list_sessions": self._handle_list_sessions,
+            "get_resource": self._handle_get_resource,
+            "ping": self._handle_ping,
+        }
+
+    async def _send(self, websocket: WebSocket, payload: dict):
+        """Send one payload as a binary frame.
+
+        Clients that negotiated the "msgpack" subprotocol get msgpack
+        (1.5-3x smaller than JSON for large tool results, and cheaper to
+        parse); everyone else gets msgspec-encoded JSON. Either way the
+        encoding happens in C and skips send_text's str->bytes copy.
+        """
+        if websocket.scope.get("codec") == "msgpack":
+            await websocket.send_bytes(_msgpack_encoder.encode(payload))
+        else:
+            await websocket.send_bytes(_json_encoder.encode(payload))
+
+    async def _send_error(self, websocket: WebSocket, message: str):
+        """Send an error frame, splicing pre-serialized bodies for the
+        constant messages on JSON connections"""
+        prefix = None
+        if websocket.scope.get("codec") != "msgpack":
+            prefix = _ERROR_PREFIXES.get(message)
+        if prefix is not None:
+            await websocket.send_bytes(prefix + now_iso().encode() + _ERROR_SUFFIX)
+        else:
+            await self._send(
+                websocket,
+                {"type": "error", "error": message, "timestamp": now_iso()},
+            )
+
     async def handle_websocket(self, websocket: WebSocket):
         """Handle WebSocket connection for real-time chat with full feature support"""
-        await websocket.accept()
+        use_msgpack = "msgpack" in websocket.scope.get("subprotocols", [])
+        if use_msgpack:
+            websocket.scope["codec"] = "msgpack"
+            await websocket.accept(subprotocol="msgpack")
+        else:
+            await websocket.accept()
 
         chatbot_service = get_chatbot_service()
         if not chatbot_service or not chatbot_service.is_initialized:
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "error": "ChatBot not initialized",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
-            )
+            await self._send_error(websocket, "ChatBot not initialized")
             await websocket.close()
             return
 
@@ -38,57 +115,38 @@ class WebSocketManager:
 
         try:
             # Send welcome message
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "welcome",
-                        "message": "🤖 Connected to Enhanced MCP ChatBot",
-                        "features": [
-                            "chat",
-                            "session_management",
-                            "tool_calls",
-                            "resources",
-                        ],
-                        "current_session": {
-                            "id": chatbot_service.chatbot.memory.current_session_id,
-                            "title": chatbot_service.chatbot.memory.get_current_session().title
-                            if chatbot_service.chatbot.memory.get_current_session()
-                            else None,
-                        },
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+            await self._send(
+                websocket,
+                {
+                    **_WELCOME_STATIC,
+                    "current_session": {
+                        "id": chatbot_service.chatbot.memory.current_session_id,
+                        "title": chatbot_service.chatbot.memory.get_current_session().title
+                        if chatbot_service.chatbot.memory.get_current_session()
+                        else None,
+                    },
+                    "timestamp": now_iso(),
+                },
             )
 
             while True:
                 # Receive message from client
-                data = await websocket.receive_text()
-
                 try:
-                    message_data = json.loads(data)
+                    if use_msgpack:
+                        message_data = msgspec.msgpack.decode(
+                            await websocket.receive_bytes()
+                        )
+                    else:
+                        message_data = msgspec.json.decode(
+                            await websocket.receive_text()
+                        )
                     await self._handle_message(websocket, message_data, chatbot_service)
 
-                except json.JSONDecodeError:
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "error",
-                                "error": "Invalid JSON format",
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+                except msgspec.DecodeError:
+                    await self._send_error(websocket, "Invalid message format")
                 except Exception as e:
                     logger.error(f"WebSocket error: {e}")
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "error",
-                                "error": str(e),
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+                    await self._send_error(websocket, str(e))
 
         except WebSocketDisconnect:
             logger.info("WebSocket client disconnected")
@@ -101,63 +159,57 @@ class WebSocketManager:
         """Handle individual WebSocket messages"""
         message_type = message_data.get("type", "chat")
 
-        if message_type == "chat":
-            await self._handle_chat_message(websocket, message_data, chatbot_service)
-        elif message_type == "create_session":
-            await self._handle_create_session(websocket, message_data, chatbot_service)
-        elif message_type == "switch_session":
-            await self._handle_switch_session(websocket, message_data, chatbot_service)
-        elif message_type == "list_sessions":
-            await self._handle_list_sessions(websocket, chatbot_service)
-        elif message_type == "get_resource":
-            await self._handle_get_resource(websocket, message_data, chatbot_service)
-        elif message_type == "ping":
-            await self._handle_ping(websocket)
-        else:
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "error": f"Unknown message type: {message_type}",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+        handler = self._handlers.get(message_type)
+        if handler is None:
+            await self._send_error(
+                websocket, f"Unknown message type: {message_type}"
             )
+            return
+        await handler(websocket, message_data, chatbot_service)
 
     async def _handle_chat_message(
         self, websocket: WebSocket, message_data: dict, chatbot_service
     ):
         """Handle chat messages"""
-        query = message_data.get("query", "")
-        session_id = message_data.get("session_id")
+        # Same validation path as the REST endpoint: pydantic-core rejects
+        # empty/oversized queries before any chatbot work happens.
+        try:
+            request = ChatRequest.model_validate(message_data)
+        except ValidationError:
+            await self._send_error(websocket, "No query provided")
+            return
+        query, session_id = request.query, request.session_id
 
-        if not query:
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "error": "No query provided",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+        # Stream deltas as the model generates them; the final envelope
+        # keeps the familiar chat_response shape.
+        result = None
+        try:
+            async for kind, payload in chatbot_service.process_query_stream(
+                query, session_id
+            ):
+                if kind == "delta":
+                    await self._send(
+                        websocket, {"type": "chat_delta", "text": payload}
+                    )
+                else:
+                    result = payload
+        except asyncio.TimeoutError:
+            await self._send_error(
+                websocket, "Server is at capacity; please retry shortly"
             )
             return
 
-        # Process the chat query
-        result = await chatbot_service.process_query(query, session_id)
-
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "chat_response",
-                    "response": result["response"],
-                    "session_id": result["session_id"],
-                    "session_title": result["session_title"],
-                    "tool_calls": result["tool_calls"],
-                    "message_count": result["message_count"],
-                    "timestamp": result["timestamp"],
-                }
-            )
+        await self._send(
+            websocket,
+            {
+                "type": "chat_response",
+                "response": result["response"],
+                "session_id": result["session_id"],
+                "session_title": result["session_title"],
+                "tool_calls": result["tool_calls"],
+                "message_count": result["message_count"],
+                "timestamp": result["timestamp"],
+            },
         )
 
     async def _handle_create_session(
@@ -168,15 +220,14 @@ class WebSocketManager:
         session_id = chatbot_service.chatbot.memory.create_session(title)
         session = chatbot_service.chatbot.memory.get_current_session()
 
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "session_created",
-                    "session_id": session_id,
-                    "title": session.title,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+        await self._send(
+            websocket,
+            {
+                "type": "session_created",
+                "session_id": session_id,
+                "title": session.title,
+                "timestamp": now_iso(),
+            },
         )
 
     async def _handle_switch_session(
@@ -186,39 +237,31 @@ class WebSocketManager:
         session_id = message_data.get("session_id")
         if chatbot_service.chatbot.memory.switch_session(session_id):
             session = chatbot_service.chatbot.memory.get_current_session()
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "session_switched",
-                        "session_id": session_id,
-                        "title": session.title,
-                        "message_count": len(session.messages),
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+            await self._send(
+                websocket,
+                {
+                    "type": "session_switched",
+                    "session_id": session_id,
+                    "title": session.title,
+                    "message_count": len(session.messages),
+                    "timestamp": now_iso(),
+                },
             )
         else:
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "error": "Session not found",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
-            )
+            await self._send_error(websocket, "Session not found")
 
-    async def _handle_list_sessions(self, websocket: WebSocket, chatbot_service):
+    async def _handle_list_sessions(
+        self, websocket: WebSocket, message_data: dict, chatbot_service
+    ):
         """Handle session listing"""
         sessions = chatbot_service.chatbot.memory.list_sessions()
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "sessions_list",
-                    "sessions": sessions,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+        await self._send(
+            websocket,
+            {
+                "type": "sessions_list",
+                "sessions": sessions,
+                "timestamp": now_iso(),
+            },
         )
 
     async def _handle_get_resource(
@@ -228,22 +271,19 @@ class WebSocketManager:
         resource_uri = message_data.get("resource_uri")
         if resource_uri:
             result = await chatbot_service.get_resource(resource_uri)
-            await websocket.send_text(
-                json.dumps({"type": "resource_response", **result})
-            )
+            await self._send(websocket, {"type": "resource_response", **result})
         else:
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "error": "No resource_uri provided",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
-            )
+            await self._send_error(websocket, "No resource_uri provided")
 
-    async def _handle_ping(self, websocket: WebSocket):
+    async def _handle_ping(
+        self, websocket: WebSocket, message_data: dict, chatbot_service
+    ):
         """Handle ping messages"""
-        await websocket.send_text(
-            json.dumps({"type": "pong", "timestamp": datetime.now().isoformat()})
-        )
+        if websocket.scope.get("codec") == "msgpack":
+            await self._send(
+                websocket, {"type": "pong", "timestamp": now_iso()}
+            )
+        else:
+            await websocket.send_bytes(
+                _PONG_PREFIX + now_iso().encode() + _PONG_SUFFIX
+            )